@@ -1,100 +1,305 @@
-import os
+import asyncio
 import json
 import csv
+import os
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
 from dotenv import load_dotenv
-from firecrawl import FirecrawlApp
+from firecrawl_pool import KeyPool, response_field
+from llm_fallback import JOB_SCHEMA, text_fingerprint
+from retry_policy import call_with_retry, poll_with_retry, retry_stats
+from response_cache import ExtractCache, ResponseCache
+from seen_index import SeenIndex
+from url_canon import canonicalize_url
 
 load_dotenv()
 
 # Load API keys
-API_KEYS = [os.getenv(f'FIRECRAWL_API_KEY{"" if i == 0 else f"_{i}"}') for i in range(1, 6)]
-API_KEYS = [key for key in API_KEYS if key]
+key_pool = KeyPool.from_env()
+
+# A running extract job holds one key slot until its polling ends, so at most this many run at once
+EXTRACT_SLOTS = len(key_pool) * key_pool.max_in_flight
+
+# Polls get their own threads: submits and scrapes blocked on a full key pool in the default executor
+# must never keep the polls that would free a slot from running
+_poll_executor = ThreadPoolExecutor(max_workers=EXTRACT_SLOTS, thread_name_prefix='extract-poll')
+_extract_slots = None
 
-current_key_index = 0
-app = FirecrawlApp(api_key=API_KEYS[current_key_index])
+# Page HTML is shared with job_scraper's cache; extract results are reused while pages are unchanged
+response_cache = ResponseCache()
+extract_cache = ExtractCache()
 
+# Extract jobs are polled from about when they usually finish, backing off up to the maximum
+EXTRACT_POLL_MIN = float(os.getenv('AI_EXTRACT_POLL_MIN', '1'))
+EXTRACT_POLL_MAX = float(os.getenv('AI_EXTRACT_POLL_MAX', '15'))
+EXTRACT_POLL_BACKOFF = 1.5
+EXTRACT_TIMEOUT = float(os.getenv('AI_EXTRACT_TIMEOUT', '300'))
 
-def rotate_key():
-    global current_key_index, app
-    current_key_index = (current_key_index + 1) % len(API_KEYS)
-    app = FirecrawlApp(api_key=API_KEYS[current_key_index])
+# Pages requested within the linger window share one multi-URL extract job, up to the batch size
+EXTRACT_BATCH_SIZE = int(os.getenv('AI_EXTRACT_BATCH_SIZE', '4'))
+EXTRACT_BATCH_LINGER = float(os.getenv('AI_EXTRACT_BATCH_LINGER', '2'))
 
 
-JOB_SCHEMA = {
+# Multi-URL extracts ask for jobs grouped by the page they came from so they can be attributed
+BATCH_JOB_SCHEMA = {
     "type": "object",
     "properties": {
-        "jobs": {
+        "pages": {
             "type": "array",
             "items": {
                 "type": "object",
                 "properties": {
-                    "title": {"type": "string"},
-                    "company": {"type": "string"},
-                    "location": {"type": "string"},
-                    "job_type": {"type": "string"},
-                    "apply_url": {"type": "string"}
+                    "page_url": {
+                        "type": "string",
+                        "description": "URL of the page these jobs were listed on"
+                    },
+                    "jobs": JOB_SCHEMA["properties"]["jobs"],
+                    "next_page_url": JOB_SCHEMA["properties"]["next_page_url"]
                 }
             }
-        },
-        "next_page_url": {
-            "type": "string",
-            "description": "URL of the next page button or link"
         }
     }
 }
 
 
-def scrape_site(url, max_pages=2):
+def page_fingerprint(url):
+    # Cheap scrape (or cached HTML) reduced to visible text, so markup churn doesn't count as a change
+    result = response_cache.get(url, ['html'])
+    if result is None:
+        result = call_with_retry(key_pool, lambda lane: lane.app.scrape(url, formats=['html']), url=url)
+        if result is None or not getattr(result, 'html', None):
+            return None
+        response_cache.put(url, ['html'], result)
+    
+    return text_fingerprint(result.html)
+
+
+class PollSchedule:
+    #Poll delays for extract jobs: the first near the typical job duration seen so far, then backing off
+    
+    def __init__(self, minimum=EXTRACT_POLL_MIN, maximum=EXTRACT_POLL_MAX, backoff=EXTRACT_POLL_BACKOFF):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff = backoff
+        self.typical = None
+    
+    def first(self):
+        if self.typical is None:
+            return self.minimum
+        return min(max(self.typical * 0.8, self.minimum), self.maximum)
+    
+    def next(self, delay):
+        return min(delay * self.backoff, self.maximum)
+    
+    def observe(self, seconds):
+        # Moving average of how long finished jobs took
+        self.typical = seconds if self.typical is None else 0.7 * self.typical + 0.3 * seconds
+
+
+poll_schedule = PollSchedule()
+
+
+def submit_extract(urls, schema):
+    # The key keeps a concurrency slot until the job is finished, so per-key limits cover running jobs
+    def submit(lane):
+        job_id = response_field(lane.app.start_extract(urls=urls, schema=schema), 'id')
+        if job_id:
+            key_pool.retain(lane)
+        return lane, job_id
+    
+    submitted = call_with_retry(key_pool, submit, url=urls[0])
+    return submitted if submitted and submitted[1] else None
+
+
+def extract_status(lane, job_id, deadline):
+    # Jobs belong to the key that started them, so polls go to that key too
+    return poll_with_retry(key_pool, lane, lambda lane: lane.app.get_extract_status(job_id), deadline)
+
+
+async def run_extract(urls, schema):
+    # Waiting for a slot here rather than inside KeyPool.acquire keeps submits from piling up on threads
+    async with _extract_slots:
+        return await _run_extract(urls, schema)
+
+
+async def _run_extract(urls, schema):
+    submitted = await asyncio.to_thread(submit_extract, urls, schema)
+    if not submitted:
+        return None
+    
+    lane, job_id = submitted
+    started = time.monotonic()
+    loop = asyncio.get_running_loop()
+    try:
+        delay = poll_schedule.first()
+        while time.monotonic() - started < EXTRACT_TIMEOUT:
+            await asyncio.sleep(delay)
+            status = await loop.run_in_executor(_poll_executor, extract_status, lane, job_id, started + EXTRACT_TIMEOUT)
+            if status is None:
+                return None
+            
+            state = response_field(status, 'status')
+            if state == 'completed':
+                poll_schedule.observe(time.monotonic() - started)
+                data = response_field(status, 'data')
+                return data[0] if isinstance(data, list) and data else data
+            if state in ('failed', 'cancelled'):
+                print(f"Extract {job_id} for {', '.join(urls)} {state}: {response_field(status, 'error')}")
+                return None
+            delay = poll_schedule.next(delay)
+        
+        print(f"Extract {job_id} for {', '.join(urls)} timed out after {EXTRACT_TIMEOUT:.0f}s")
+        return None
+    finally:
+        key_pool.release(lane)
+
+
+def attribute_pages(urls, data):
+    #Split a multi-URL extract result back into per-page data keyed by the requested URLs
+    by_url = {canonicalize_url(url): url for url in urls}
+    by_host = {}
+    for url in urls:
+        by_host.setdefault(urlsplit(url).netloc.lower(), []).append(url)
+    
+    pages = {}
+    for page in (data or {}).get('pages') or []:
+        url = by_url.get(canonicalize_url(page.get('page_url') or ''))
+        if url is None:
+            # A mangled page_url is still unambiguous when only one requested page is on that host
+            hosts = {urlsplit(job.get('apply_url') or '').netloc.lower() for job in page.get('jobs') or []}
+            candidates = {u for host in hosts for u in by_host.get(host, [])}
+            if len(candidates) != 1:
+                continue
+            url = candidates.pop()
+        
+        result = pages.setdefault(url, {'jobs': [], 'next_page_url': None})
+        result['jobs'].extend(page.get('jobs') or [])
+        result['next_page_url'] = result['next_page_url'] or page.get('next_page_url')
+    return pages
+
+
+async def extract_batch(urls):
+    #Extract several pages in one job; pages the result doesn't cover are retried on their own
+    if len(urls) == 1:
+        data = await run_extract(urls, JOB_SCHEMA)
+        return {urls[0]: data} if data else {}
+    
+    pages = attribute_pages(urls, await run_extract(urls, BATCH_JOB_SCHEMA))
+    missing = [url for url in urls if url not in pages]
+    if missing:
+        print(f"Batched extract missed {len(missing)} of {len(urls)} pages; extracting them singly")
+        for single in await asyncio.gather(*(extract_batch([url]) for url in missing)):
+            pages.update(single)
+    return pages
+
+
+class ExtractBatcher:
+    #Coalesces pages requested close together into multi-URL extract jobs
+    
+    def __init__(self, batch_size=EXTRACT_BATCH_SIZE, linger=EXTRACT_BATCH_LINGER):
+        self.batch_size = max(1, batch_size)
+        self.linger = linger
+        self.pending = []
+        self.timer = None
+        self.jobs = set()
+    
+    async def extract(self, url):
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((url, future))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+        elif self.timer is None:
+            self.timer = asyncio.get_running_loop().call_later(self.linger, self.flush)
+        return await future
+    
+    def flush(self):
+        if self.timer:
+            self.timer.cancel()
+            self.timer = None
+        batch, self.pending = self.pending, []
+        if batch:
+            job = asyncio.create_task(self._run(batch))
+            self.jobs.add(job)
+            job.add_done_callback(self.jobs.discard)
+    
+    async def _run(self, batch):
+        pages = {}
+        try:
+            pages = await extract_batch(list(dict.fromkeys(url for url, _ in batch)))
+        finally:
+            # A failed batch leaves its pages without data rather than hanging their sites
+            for url, future in batch:
+                if not future.done():
+                    future.set_result(pages.get(url))
+
+
+_batcher = None
+
+
+async def extract_page(url):
+    fingerprint = await asyncio.to_thread(page_fingerprint, url)
+    if fingerprint:
+        data = extract_cache.get(url, JOB_SCHEMA, fingerprint)
+        if data is not None:
+            return data
+    
+    data = await _batcher.extract(url)
+    if not data:
+        return None
+    
+    if fingerprint:
+        extract_cache.put(url, JOB_SCHEMA, fingerprint, data)
+    return data
+
+
+async def scrape_site(url, max_pages=2, known=frozenset()):
     all_jobs = []
     current_url = url
     page_count = 0
     
     while current_url and page_count < max_pages:
         page_count += 1
-        try:
-            result = app.extract(urls=[current_url], schema=JOB_SCHEMA)
-            
-            if not result or not result.data:
-                break
-            
-            data = result.data[0] if isinstance(result.data, list) else result.data
-            jobs = data.get('jobs', [])
-            if jobs:
-                all_jobs.extend(jobs)
-            
-            next_url = data.get('next_page_url')
-            if not next_url or next_url == current_url:
-                break
-            
-            current_url = next_url
-            time.sleep(2)
-            
-        except Exception as e:
-            if 'Payment Required' in str(e) or 'Insufficient credits' in str(e):
-                rotate_key()
-                time.sleep(2)
-                try:
-                    result = app.extract(urls=[current_url], schema=JOB_SCHEMA)
-                    if result and result.data:
-                        data = result.data[0] if isinstance(result.data, list) else result.data
-                        jobs = data.get('jobs', [])
-                        if jobs:
-                            all_jobs.extend(jobs)
-                        next_url = data.get('next_page_url')
-                        if next_url and next_url != current_url:
-                            current_url = next_url
-                        else:
-                            break
-                except:
-                    break
-            else:
-                break
+        data = await extract_page(current_url)
+        if not data:
+            break
+        
+        jobs = data.get('jobs', [])
+        if jobs:
+            all_jobs.extend(jobs)
+        
+        # Incremental runs stop following the chain at a page with nothing new
+        if known and jobs and all(canonicalize_url(job.get('apply_url') or '') in known for job in jobs):
+            break
+        
+        next_url = data.get('next_page_url')
+        if not next_url or next_url == current_url:
+            break
+        
+        current_url = next_url
+    
+    return all_jobs
+
+
+async def scrape_sites(sites, known=frozenset(), batch_size=EXTRACT_BATCH_SIZE):
+    # Every site's extract chain is in flight at once; results are taken in completion order
+    global _batcher, _extract_slots
+    _batcher = ExtractBatcher(batch_size)
+    _extract_slots = asyncio.Semaphore(EXTRACT_SLOTS)
+    
+    async def run(url):
+        return url, await scrape_site(url, max_pages=2, known=known)
     
+    all_jobs = []
+    for finished in asyncio.as_completed([run(url) for url in sites]):
+        url, jobs = await finished
+        print(f"Extracted {len(jobs)} jobs from {url}")
+        all_jobs.extend(jobs)
     return all_jobs
 
 
-def main():
+def main(incremental=False):
     sites = [
         "https://jobs.workable.com/search?location=Pātan%2C+Nepal",
         "https://dynamitejobs.com/remote-jobs",
@@ -105,30 +310,43 @@ def main():
         "https://remote.co/remote-jobs/marketing"
     ]
     
-    all_jobs = []
-    for url in sites:
-        jobs = scrape_site(url, max_pages=2)
-        all_jobs.extend(jobs)
-        time.sleep(3)
+    seen_index = SeenIndex()
+    known = seen_index.known_urls() if incremental else frozenset()
+    
+    all_jobs = asyncio.run(scrape_sites(sites, known))
     
     # Deduplicate
     seen = set()
     unique = []
     for job in all_jobs:
-        url = job.get('apply_url', '')
+        url = canonicalize_url(job['apply_url']) if job.get('apply_url') else ''
         if url and url not in seen:
+            job['apply_url'] = url
             seen.add(url)
             unique.append(job)
     
+    new, known_jobs = seen_index.split_new(unique)
+    seen_index.record(unique)
+    seen_index.save()
+    
+    # Incremental runs save only listings not seen before
+    if incremental:
+        print(f"New listings: {len(new)}, refreshed last_seen for {len(known_jobs)} known")
+        unique = new
+    json_file, csv_file = ('jobs_new.json', 'jobs_new.csv') if incremental else ('jobs.json', 'jobs.csv')
+    
     # Save
-    with open('jobs.json', 'w', encoding='utf-8') as f:
+    with open(json_file, 'w', encoding='utf-8') as f:
         json.dump(unique, f, indent=2, ensure_ascii=False)
     
-    with open('jobs.csv', 'w', newline='', encoding='utf-8') as f:
+    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
         if unique:
             writer = csv.DictWriter(f, fieldnames=['title', 'company', 'location', 'job_type', 'apply_url'])
             writer.writeheader()
             writer.writerows(unique)
+    
+    print(f"Request errors: {retry_stats.summary()}")
+    print(f"Extract cache: {extract_cache.hits} reused, {extract_cache.misses} extracted")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(incremental='--incremental' in sys.argv[1:])
\ No newline at end of file
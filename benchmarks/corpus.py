@@ -0,0 +1,32 @@
+# Offline corpus of saved listing pages, one directory per source under fixtures/
+import os
+from typing import Callable, Dict, Iterator, List, Tuple
+from parsers import parse_dynamitejobs, parse_mercor, parse_remoteco, parse_remotive, parse_workable
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fixtures')
+
+SOURCE_PARSERS: Dict[str, Callable] = {
+    'workable': parse_workable,
+    'dynamitejobs': parse_dynamitejobs,
+    'remotive': parse_remotive,
+    'mercor': parse_mercor,
+    'remoteco': parse_remoteco,
+}
+
+
+def load_pages(source: str) -> List[Tuple[str, str]]:
+    #(file name, html) for every saved page of a source
+    directory = os.path.join(FIXTURE_DIR, source)
+    pages = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith('.html'):
+            with open(os.path.join(directory, name), encoding='utf-8') as f:
+                pages.append((name, f.read()))
+    return pages
+
+
+def iter_corpus() -> Iterator[Tuple[str, str, str, Callable]]:
+    #(source, file name, html, parser) across the whole corpus
+    for source, parser in SOURCE_PARSERS.items():
+        for name, html in load_pages(source):
+            yield source, name, html, parser
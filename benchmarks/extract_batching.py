@@ -0,0 +1,73 @@
+# Latency versus extract credits for ai_scraper's multi-URL extract batching, swept over batch
+# sizes against the fake Firecrawl server with empty caches on every trial.
+# Run from the repository root: python -m benchmarks.extract_batching --batch-sizes 1 2 4 7
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import Dict
+from benchmarks.fake_firecrawl import FakeConfig, start_server
+
+SITES = [
+    "https://jobs.workable.com/search?location=Pātan%2C+Nepal",
+    "https://dynamitejobs.com/remote-jobs",
+    "https://remotive.com/remote-jobs",
+    "https://work.mercor.com/explore",
+    "https://remote.co/remote-jobs/developer",
+    "https://remote.co/remote-jobs/design",
+    "https://remote.co/remote-jobs/marketing",
+]
+
+
+def run_trial(ai_scraper, state, batch_size: int) -> Dict:
+    from response_cache import ExtractCache, ResponseCache
+
+    state.reset()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        ai_scraper.response_cache = ResponseCache(os.path.join(cache_dir, 'pages'))
+        ai_scraper.extract_cache = ExtractCache(os.path.join(cache_dir, 'extract'))
+        start = time.perf_counter()
+        jobs = asyncio.run(ai_scraper.scrape_sites(SITES, batch_size=batch_size))
+        wall = time.perf_counter() - start
+
+    credits = state.snapshot()['endpoint_credits']
+    return {
+        'batch_size': batch_size,
+        'jobs': len(jobs),
+        'wall': wall,
+        'extract_credits': credits.get('extract', 0),
+        'scrape_credits': credits.get('scrape', 0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep ai_scraper extract batch sizes against a fake Firecrawl server")
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 2, 4, 7])
+    parser.add_argument('--latency-ms', type=float, default=300.0)
+    parser.add_argument('--latency-sigma', type=float, default=0.5)
+    parser.add_argument('--keys', type=int, default=1)
+    args = parser.parse_args()
+
+    server, state = start_server(FakeConfig(args.latency_ms, args.latency_sigma))
+
+    # ai_scraper reads its endpoint, keys and pacing at import time
+    os.environ['FIRECRAWL_API_URL'] = f"http://127.0.0.1:{server.server_address[1]}"
+    for i in range(args.keys):
+        os.environ.setdefault(f"FIRECRAWL_API_KEY_{i + 1}", f"fc-batch-{i}")
+    os.environ.setdefault('SCRAPER_DOMAIN_RPM', '6000')
+    os.environ.setdefault('FIRECRAWL_KEY_RPM', '6000')
+    os.environ.setdefault('AI_EXTRACT_POLL_MIN', '0.2')
+    os.environ.setdefault('AI_EXTRACT_BATCH_LINGER', '0.5')
+    import ai_scraper
+
+    print(f"{'batch':>5}{'jobs':>7}{'wall s':>9}{'extract cr':>12}{'scrape cr':>11}")
+    for batch_size in args.batch_sizes:
+        r = run_trial(ai_scraper, state, batch_size)
+        print(f"{r['batch_size']:>5}{r['jobs']:>7}{r['wall']:>9.1f}{r['extract_credits']:>12}{r['scrape_credits']:>11}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+# Local stand-in for the Firecrawl v2 API, serving fixture pages for load tests.
+# Run from the repository root: python -m benchmarks.fake_firecrawl --port 3002
+# then point the scrapers at it with FIRECRAWL_API_URL=http://127.0.0.1:3002
+import argparse
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+import uuid
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+from benchmarks.corpus import FIXTURE_DIR, SOURCE_PARSERS
+
+NOT_FOUND_HTML = "<html><body><h1>404 Not Found</h1></body></html>"
+EMPTY_RESULTS_HTML = "<html><body><p>No remote jobs found.</p></body></html>"
+
+# Firecrawl bills extract by the page; a rough constant keeps credit reports comparable
+EXTRACT_CREDITS = 5
+# Fixed prompt overhead paid once per extract job, however many pages it covers
+EXTRACT_JOB_CREDITS = 3
+
+
+class FakeConfig:
+    #Latency, fault injection and quota knobs for the fake server
+
+    def __init__(self, latency_ms: float = 300.0, latency_sigma: float = 0.5, rate_429: float = 0.0,
+                 rate_402: float = 0.0, key_quota: Optional[int] = None, retry_after: int = 2, seed: int = 0,
+                 dynamite_pages: Optional[int] = None):
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.rate_429 = rate_429
+        self.rate_402 = rate_402
+        self.key_quota = key_quota
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        # Distinct DynamiteJobs result pages, with empty pages past them; None cycles the fixtures forever
+        self.dynamite_pages = dynamite_pages
+
+    def sample_latency(self) -> float:
+        # Lognormal around the configured median gives a realistic long tail
+        if self.latency_ms <= 0:
+            return 0.0
+        return self.random.lognormvariate(math.log(self.latency_ms / 1000.0), self.latency_sigma)
+
+
+class FakeState:
+    #Per-key credit usage, response counters and pending extract and batch scrape jobs
+
+    def __init__(self, config: FakeConfig):
+        self.config = config
+        self.credits: Counter = Counter()
+        self.endpoint_credits: Counter = Counter()
+        self.responses: Counter = Counter()
+        self.latencies: List[float] = []
+        self.extract_jobs: Dict[str, Dict] = {}
+        self.batch_jobs: Dict[str, Dict] = {}
+        self.lock = threading.Lock()
+
+    def reset(self) -> None:
+        with self.lock:
+            self.credits.clear()
+            self.endpoint_credits.clear()
+            self.responses.clear()
+            self.latencies.clear()
+            self.extract_jobs.clear()
+            self.batch_jobs.clear()
+
+    def snapshot(self) -> Dict:
+        with self.lock:
+            return {
+                'credits': dict(self.credits),
+                'credits_total': sum(self.credits.values()),
+                'endpoint_credits': dict(self.endpoint_credits),
+                'responses': dict(self.responses),
+            }
+
+
+def fixture_for(url: str) -> Tuple[Optional[str], Optional[str]]:
+    #Map a target URL onto (source, fixture path) in the offline corpus
+    parsed = urlparse(url)
+    host = parsed.netloc.lower()
+
+    if host == 'jobs.workable.com':
+        return 'workable', os.path.join(FIXTURE_DIR, 'workable', 'search.html')
+    if host == 'dynamitejobs.com':
+        page = int(parse_qs(parsed.query).get('page', ['1'])[0])
+        pages = sorted(os.listdir(os.path.join(FIXTURE_DIR, 'dynamitejobs')))
+        return 'dynamitejobs', os.path.join(FIXTURE_DIR, 'dynamitejobs', pages[(page - 1) % len(pages)])
+    if host == 'remotive.com':
+        return 'remotive', os.path.join(FIXTURE_DIR, 'remotive', 'remote-jobs.html')
+    if host == 'work.mercor.com':
+        return 'mercor', os.path.join(FIXTURE_DIR, 'mercor', 'explore.html')
+    if host == 'remote.co':
+        category = parsed.path.rstrip('/').split('/')[-1]
+        pages = sorted(os.listdir(os.path.join(FIXTURE_DIR, 'remoteco')))
+        name = f"{category}.html" if f"{category}.html" in pages else pages[zlib.crc32(category.encode()) % len(pages)]
+        return 'remoteco', os.path.join(FIXTURE_DIR, 'remoteco', name)
+    return None, None
+
+
+def render_page(url: str, dynamite_pages: Optional[int] = None) -> Tuple[str, int]:
+    source, path = fixture_for(url)
+    if not path:
+        return NOT_FOUND_HTML, 404
+    with open(path, encoding='utf-8') as f:
+        html = f.read()
+
+    if source == 'dynamitejobs' and dynamite_pages:
+        # A site of that many pages: each lists its own listings, and pages past the end list none
+        page = int(parse_qs(urlparse(url).query).get('page', ['1'])[0])
+        if page > dynamite_pages:
+            return EMPTY_RESULTS_HTML, 200
+        html = html.replace('/remote-job/', f'/remote-job/p{page}-')
+        # The pager only links pages that exist
+        html = re.sub(r'<a href="/remote-jobs\?page=(\d+)">\d+</a>',
+                      lambda m: m.group(0) if int(m.group(1)) <= dynamite_pages else '', html)
+    return html, 200
+
+
+def scrape_document(url: str, formats: List, dynamite_pages: Optional[int] = None) -> Dict:
+    html, status = render_page(url, dynamite_pages)
+    # v2 accepts format names or objects such as {"type": "html"}
+    formats = {f if isinstance(f, str) else f.get('type') for f in formats or ['markdown']}
+    data = {'metadata': {'sourceURL': url, 'statusCode': status}}
+    if 'html' in formats or 'rawHtml' in formats:
+        data['html'] = html
+    if 'markdown' in formats:
+        data['markdown'] = re.sub(r'<[^>]+>', ' ', html)
+    return data
+
+
+def extract_jobs(url: str, dynamite_pages: Optional[int] = None) -> Dict:
+    #Answer an extract the way the LLM would: the jobs on the page, no next page
+    source, path = fixture_for(url)
+    if not path:
+        return {'jobs': []}
+    html, _ = render_page(url, dynamite_pages)
+    jobs = [
+        {key: job[key] for key in ('title', 'company', 'location', 'job_type', 'apply_url')}
+        for job in SOURCE_PARSERS[source](html)
+    ]
+    return {'jobs': jobs, 'next_page_url': None}
+
+
+class FakeFirecrawlHandler(BaseHTTPRequestHandler):
+    server_version = 'FakeFirecrawl/1.0'
+    state: FakeState = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: Dict, headers: Optional[Dict[str, str]] = None) -> None:
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+        with self.state.lock:
+            self.state.responses[status] += 1
+
+    def _read_json(self) -> Dict:
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def _api_key(self) -> str:
+        return self.headers.get('Authorization', '').replace('Bearer ', '', 1)
+
+    def _rate_limited(self) -> bool:
+        #Inject a 429 at the configured rate; True when it was sent
+        config = self.state.config
+        if config.random.random() < config.rate_429:
+            self._send(429, {
+                'success': False,
+                'error': f"Rate limit exceeded. Consumed (req/min): 100, Remaining (req/min): 0. "
+                         f"Please retry after {config.retry_after}s, resets at {time.ctime()}",
+            }, {'Retry-After': str(config.retry_after)})
+            return True
+        return False
+
+    def _admit(self, credits: int, endpoint: str = 'scrape') -> bool:
+        #Apply injected faults and quotas; False when an error response was already sent
+        config = self.state.config
+        key = self._api_key()
+
+        if self._rate_limited():
+            return False
+
+        with self.state.lock:
+            over_quota = config.key_quota is not None and self.state.credits[key] + credits > config.key_quota
+        if over_quota or config.random.random() < config.rate_402:
+            self._send(402, {'success': False, 'error': "Payment Required: Insufficient credits to perform this request."})
+            return False
+
+        with self.state.lock:
+            self.state.credits[key] += credits
+            self.state.endpoint_credits[endpoint] += credits
+        return True
+
+    def _delay(self) -> None:
+        latency = self.state.config.sample_latency()
+        time.sleep(latency)
+        with self.state.lock:
+            self.state.latencies.append(latency)
+
+    def do_POST(self):
+        path = urlparse(self.path).path.rstrip('/')
+        body = self._read_json()
+
+        if path == '/v2/scrape':
+            self._delay()
+            if not self._admit(1):
+                return
+            self._send(200, {'success': True, 'data': scrape_document(body.get('url', ''), body.get('formats'),
+                                                                    self.state.config.dynamite_pages)})
+            return
+
+        if path == '/v2/batch/scrape':
+            urls = body.get('urls') or []
+            if not self._admit(len(urls), 'batch_scrape'):
+                return
+            # Pages finish independently, each after its own sampled latency
+            job_id = str(uuid.uuid4())
+            now = time.monotonic()
+            with self.state.lock:
+                self.state.batch_jobs[job_id] = {
+                    'pages': [(now + self.state.config.sample_latency(), url) for url in urls],
+                    'formats': body.get('formats'),
+                }
+            self._send(200, {'success': True, 'id': job_id, 'url': f"/v2/batch/scrape/{job_id}"})
+            return
+
+        if path == '/v2/extract':
+            urls = body.get('urls') or []
+            if not self._admit(EXTRACT_JOB_CREDITS + EXTRACT_CREDITS * max(1, len(urls)), 'extract'):
+                return
+            # LLM time grows with the amount of page content in the job
+            job_id = str(uuid.uuid4())
+            with self.state.lock:
+                self.state.extract_jobs[job_id] = {
+                    'urls': urls,
+                    'by_page': 'pages' in ((body.get('schema') or {}).get('properties') or {}),
+                    'ready_at': time.monotonic() + self.state.config.sample_latency() * (2 + len(urls)),
+                }
+            self._send(200, {'success': True, 'id': job_id})
+            return
+
+        self._send(404, {'success': False, 'error': f"Unknown endpoint {path}"})
+
+    def do_GET(self):
+        path = urlparse(self.path).path.rstrip('/')
+
+        if path == '/stats':
+            self._send(200, self.state.snapshot())
+            return
+
+        # Status polls are free but rate limited like everything else
+        if path.startswith(('/v2/batch/scrape/', '/v2/extract/')) and self._rate_limited():
+            return
+
+        match = re.fullmatch(r'/v2/batch/scrape/([\w-]+)', path)
+        if match:
+            with self.state.lock:
+                job = self.state.batch_jobs.get(match.group(1))
+            if not job:
+                self._send(404, {'success': False, 'error': 'Batch scrape job not found'})
+                return
+            now = time.monotonic()
+            data = [scrape_document(url, job['formats'], self.state.config.dynamite_pages)
+                    for ready_at, url in job['pages'] if ready_at <= now]
+            self._send(200, {'success': True, 'status': 'completed' if len(data) == len(job['pages']) else 'scraping',
+                             'total': len(job['pages']), 'completed': len(data), 'creditsUsed': len(data),
+                             'data': data, 'next': None})
+            return
+
+        match = re.fullmatch(r'/v2/extract/([\w-]+)', path)
+        if match:
+            with self.state.lock:
+                job = self.state.extract_jobs.get(match.group(1))
+            if not job:
+                self._send(404, {'success': False, 'error': 'Extract job not found'})
+                return
+            if time.monotonic() < job['ready_at']:
+                self._send(200, {'success': True, 'status': 'processing'})
+                return
+            results = [extract_jobs(url, self.state.config.dynamite_pages) for url in job['urls']]
+            if job['by_page']:
+                data = {'pages': [dict(result, page_url=url) for url, result in zip(job['urls'], results)]}
+            else:
+                data = {'jobs': [j for result in results for j in result['jobs']], 'next_page_url': None}
+            self._send(200, {'success': True, 'status': 'completed', 'data': data,
+                             'creditsUsed': EXTRACT_JOB_CREDITS + EXTRACT_CREDITS * len(job['urls'])})
+            return
+
+        self._send(404, {'success': False, 'error': f"Unknown endpoint {path}"})
+
+
+def start_server(config: FakeConfig, host: str = '127.0.0.1', port: int = 0) -> Tuple[ThreadingHTTPServer, FakeState]:
+    #Serve on a background thread; port 0 picks a free port (see server.server_address)
+    state = FakeState(config)
+    handler = type('Handler', (FakeFirecrawlHandler,), {'state': state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local fake Firecrawl API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=3002)
+    parser.add_argument('--latency-ms', type=float, default=300.0, help="median response latency")
+    parser.add_argument('--latency-sigma', type=float, default=0.5, help="lognormal spread of latency")
+    parser.add_argument('--rate-429', type=float, default=0.0, help="fraction of requests rate limited")
+    parser.add_argument('--rate-402', type=float, default=0.0, help="fraction of requests refused for credits")
+    parser.add_argument('--key-quota', type=int, default=None, help="credits each API key may spend")
+    parser.add_argument('--dynamite-pages', type=int, default=None, help="distinct DynamiteJobs result pages")
+    args = parser.parse_args()
+
+    config = FakeConfig(args.latency_ms, args.latency_sigma, args.rate_429, args.rate_402, args.key_quota,
+                        dynamite_pages=args.dynamite_pages)
+    server, _ = start_server(config, args.host, args.port)
+    print(f"Fake Firecrawl listening on http://{args.host}:{server.server_address[1]}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
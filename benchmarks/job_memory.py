@@ -0,0 +1,56 @@
+# Bytes per job held in memory: plain dicts versus slotted, interned Job records.
+# Listings are rebuilt from jobs.json with unique URLs, decoding each record separately the way
+# jobs arrive from parser processes, so repeated values start out as distinct strings.
+# Run from the repository root: python -m benchmarks.job_memory [--count 1000000]
+import argparse
+import json
+import os
+import tracemalloc
+from typing import Callable, Dict, List
+from jobs import JOB_FIELDS, Job
+
+SAMPLE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'jobs.json')
+
+
+def sample_lines(count: int) -> List[str]:
+    #count NDJSON records cycled from the sample listings, each with its own apply_url
+    with open(SAMPLE_FILE, encoding='utf-8') as f:
+        sample = json.load(f)
+    lines = []
+    for i in range(count):
+        job = dict(sample[i % len(sample)])
+        job['apply_url'] = f"{job['apply_url']}#{i}"
+        lines.append(json.dumps(job, ensure_ascii=False))
+    return lines
+
+
+def bytes_per_job(lines: List[str], build: Callable[[Dict], object]) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    jobs = [build(json.loads(line)) for line in lines]
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del jobs
+    return held / len(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-job memory of dict and Job records")
+    parser.add_argument('--count', type=int, default=100000)
+    args = parser.parse_args()
+
+    lines = sample_lines(args.count)
+    layouts = [
+        ('dict', lambda data: {field: data.get(field) for field in JOB_FIELDS}),
+        ('Job', Job.from_dict),
+    ]
+
+    results = {name: bytes_per_job(lines, build) for name, build in layouts}
+    print(f"{'layout':<8}{'bytes/job':>12}{'MB total':>12}")
+    for name, per_job in results.items():
+        print(f"{name:<8}{per_job:>12.0f}{per_job * args.count / 1e6:>12.1f}")
+    print(f"Job saves {1 - results['Job'] / results['dict']:.0%} over dict for {args.count} jobs")
+
+
+if __name__ == "__main__":
+    main()
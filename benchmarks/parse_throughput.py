@@ -0,0 +1,110 @@
+# Parse throughput per source over the offline corpus, checked against stored baselines.
+# Run from the repository root: python -m benchmarks.parse_throughput [--save-baseline]
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+from benchmarks.corpus import SOURCE_PARSERS, load_pages
+from parser_backends import PARSER_BACKEND, PARSER_BACKENDS
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+
+
+def measure_source(source: str, backend: str, min_seconds: float) -> Dict[str, float]:
+    #Pages/sec, jobs/sec and peak traced memory for one source's parsing path
+    parser = SOURCE_PARSERS[source]
+    pages = load_pages(source)
+
+    # One untraced pass first: backends import their HTML library on first use, and whichever source ran
+    # first would otherwise count that import in its peak
+    for _, html in pages:
+        parser(html, backend)
+
+    # Peak memory of a single pass, measured separately so tracing doesn't skew timings; collected
+    # first so garbage left by the warm-up doesn't land in the peak depending on when gc runs
+    gc.collect()
+    tracemalloc.start()
+    jobs_per_pass = sum(len(parser(html, backend)) for _, html in pages)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    passes = 0
+    start = time.perf_counter()
+    while True:
+        for _, html in pages:
+            parser(html, backend)
+        passes += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            break
+
+    return {
+        'pages_per_sec': passes * len(pages) / elapsed,
+        'jobs_per_sec': passes * jobs_per_pass / elapsed,
+        'peak_kb': peak / 1024,
+    }
+
+
+def load_baselines() -> Dict:
+    if not os.path.exists(BASELINE_FILE):
+        return {}
+    with open(BASELINE_FILE, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def regressions(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+                threshold: float) -> List[str]:
+    #Sources whose throughput dropped or memory grew by more than threshold
+    found = []
+    for source, metrics in results.items():
+        expected: Optional[Dict[str, float]] = baseline.get(source)
+        if not expected:
+            continue
+        if metrics['pages_per_sec'] < expected['pages_per_sec'] * (1 - threshold):
+            found.append(f"{source}: {metrics['pages_per_sec']:.1f} pages/s vs baseline {expected['pages_per_sec']:.1f}")
+        if metrics['peak_kb'] > expected['peak_kb'] * (1 + threshold):
+            found.append(f"{source}: {metrics['peak_kb']:.0f} KB peak vs baseline {expected['peak_kb']:.0f}")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parse throughput for every source")
+    parser.add_argument('--backend', choices=PARSER_BACKENDS, default=PARSER_BACKEND)
+    parser.add_argument('--sources', nargs='+', choices=list(SOURCE_PARSERS), default=list(SOURCE_PARSERS))
+    parser.add_argument('--min-seconds', type=float, default=1.0, help="minimum timed duration per source")
+    parser.add_argument('--threshold', type=float, default=0.2, help="allowed regression as a fraction")
+    parser.add_argument('--save-baseline', action='store_true', help="store these results as the baseline")
+    args = parser.parse_args()
+
+    results = {source: measure_source(source, args.backend, args.min_seconds) for source in args.sources}
+
+    print(f"{'source':<14}{'pages/s':>12}{'jobs/s':>12}{'peak KB':>12}")
+    for source, metrics in results.items():
+        print(f"{source:<14}{metrics['pages_per_sec']:>12.1f}{metrics['jobs_per_sec']:>12.1f}{metrics['peak_kb']:>12.0f}")
+
+    baselines = load_baselines()
+    if args.save_baseline:
+        baselines[args.backend] = {**baselines.get(args.backend, {}), **results}
+        with open(BASELINE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f"\nSaved baseline for {args.backend} to {BASELINE_FILE}")
+        return
+
+    baseline = baselines.get(args.backend)
+    if not baseline:
+        print(f"\nNo baseline stored for {args.backend}; run with --save-baseline to record one")
+        return
+
+    found = regressions(results, baseline, args.threshold)
+    for regression in found:
+        print(f"REGRESSION {regression}")
+    print(f"\n{len(found)} regression(s) beyond {args.threshold:.0%} of baseline")
+    sys.exit(1 if found else 0)
+
+
+if __name__ == "__main__":
+    main()
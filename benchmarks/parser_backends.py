@@ -0,0 +1,69 @@
+# Parity check and per-page parse timing for each parser backend.
+# Run from the repository root: python -m benchmarks.parser_backends
+import argparse
+import sys
+import time
+from typing import List, Tuple
+from benchmarks.corpus import iter_corpus
+from parser_backends import HTML_PARSER, PARSER_BACKENDS, parse_document
+
+
+def available_backends(backends: List[str]) -> Tuple[List[str], List[str]]:
+    #Split the requested backends into those whose library is installed and those whose isn't
+    usable, missing = [], []
+    for backend in backends:
+        try:
+            parse_document('<p></p>', backend)
+            usable.append(backend)
+        except ImportError:
+            missing.append(backend)
+    return usable, missing
+
+
+def check_parity(backends: List[str]) -> List[str]:
+    #Compare every backend's job output against html.parser on each fixture
+    mismatches = []
+    for source, name, html, parser in iter_corpus():
+        name = f"{source}/{name}"
+        expected = parser(html, HTML_PARSER)
+        if not expected:
+            mismatches.append(f"{name}: html.parser found no jobs")
+        for backend in backends:
+            actual = parser(html, backend)
+            if actual != expected:
+                mismatches.append(f"{name}: {backend} returned {len(actual)} jobs, expected {len(expected)}")
+    return mismatches
+
+
+def time_backends(backends: List[str], repeat: int) -> None:
+    #Print mean milliseconds per page for each fixture and backend
+    print(f"\n{'fixture':<30}" + ''.join(f"{backend:>14}" for backend in backends))
+    for source, name, html, parser in iter_corpus():
+        row = f"{source + '/' + name:<30}"
+        for backend in backends:
+            start = time.perf_counter()
+            for _ in range(repeat):
+                parser(html, backend)
+            row += f"{(time.perf_counter() - start) / repeat * 1000:>12.2f}ms"
+        print(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check parser backend parity and time each backend")
+    parser.add_argument('--backends', nargs='+', choices=PARSER_BACKENDS, default=PARSER_BACKENDS)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    backends, missing = available_backends(args.backends)
+    # A requested backend that can't be checked fails the run rather than passing vacuously
+    mismatches = [f"{backend}: library not installed" for backend in missing] + check_parity(backends)
+    for mismatch in mismatches:
+        print(f"MISMATCH {mismatch}")
+    print(f"Parity: {'OK' if not mismatches else f'{len(mismatches)} mismatch(es)'} across {', '.join(backends)}")
+
+    time_backends(backends, args.repeat)
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# URL canonicalization throughput, uncached and through the memoized fast path, plus how many
+# raw variants collapse onto one canonical URL.
+# Run from the repository root: python -m benchmarks.url_canon [--count 1000000 --distinct 50000]
+import argparse
+import json
+import os
+import random
+import time
+from typing import Callable, List
+import url_canon
+
+SAMPLE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'jobs.json')
+
+# Ways the same listing URL shows up across sources and runs
+VARIANTS: List[Callable[[str], str]] = [
+    lambda url: url,
+    lambda url: url.rstrip('/') + '/',
+    lambda url: url.replace('https://', 'http://', 1),
+    lambda url: url + ('&' if '?' in url else '?') + 'utm_source=newsletter&utm_medium=email',
+    lambda url: url + '#apply',
+    lambda url: url.replace(url.split('/')[2], url.split('/')[2].upper(), 1),
+]
+
+
+def sample_urls(count: int, distinct: int, seed: int = 0) -> List[str]:
+    #count URLs drawn from distinct listings, each written in one of the VARIANTS
+    with open(SAMPLE_FILE, encoding='utf-8') as f:
+        base = [job['apply_url'].split('?')[0] for job in json.load(f) if job.get('apply_url')]
+    listings = [f"{base[i % len(base)].rstrip('/')}-{i}" for i in range(distinct)]
+    rng = random.Random(seed)
+    return [rng.choice(VARIANTS)(rng.choice(listings)) for _ in range(count)]
+
+
+def throughput(urls: List[str], canonicalize: Callable[[str], str]) -> float:
+    start = time.perf_counter()
+    for url in urls:
+        canonicalize(url)
+    return len(urls) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark URL canonicalization")
+    parser.add_argument('--count', type=int, default=1000000)
+    parser.add_argument('--distinct', type=int, default=50000, help="distinct listings behind the URLs")
+    args = parser.parse_args()
+
+    urls = sample_urls(args.count, args.distinct)
+
+    uncached = throughput(urls, url_canon._canonicalize)
+    url_canon.canonicalize_url.cache_clear()
+    memoized = throughput(urls, url_canon.canonicalize_url)
+    info = url_canon.canonicalize_url.cache_info()
+
+    print(f"{args.count} URLs over {args.distinct} listings")
+    print(f"  uncached: {uncached:>12,.0f} URLs/s")
+    print(f"  memoized: {memoized:>12,.0f} URLs/s  ({info.hits / args.count:.0%} hits, cache {info.maxsize})")
+    print(f"  distinct raw URLs: {len(set(urls)):,}, canonical: {len({url_canon.canonicalize_url(u) for u in urls}):,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+import atexit
+import gzip
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from types import SimpleNamespace
+from typing import Any, Deque, Dict, List, Optional
+
+# Cassette modes
+RECORD = 'record'
+REPLAY = 'replay'
+CASSETTE_MODES = [RECORD, REPLAY]
+
+CASSETTE_PATH = os.getenv('FIRECRAWL_CASSETTE', 'firecrawl.cassette.jsonl.gz')
+CASSETTE_MODE = os.getenv('FIRECRAWL_CASSETTE_MODE')
+CASSETTE_TIMING = os.getenv('FIRECRAWL_CASSETTE_TIMING', '0') == '1'
+
+# Firecrawl calls captured by the cassette; anything else passes straight through
+RECORDED_METHODS = {
+    'scrape', 'extract', 'start_batch_scrape', 'get_batch_scrape_status', 'start_extract', 'get_extract_status',
+}
+
+
+class ReplayedError(Exception):
+    #A Firecrawl error played back from a cassette, keeping what classify_error looks at
+
+    def __init__(self, message: str, status_code: Optional[int] = None, error_type: str = 'Exception',
+                 error_types: Optional[List[str]] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.error_type = error_type
+        # Class names of the original exception and its bases, matched like a live exception's
+        self.error_types = tuple(error_types or [error_type])
+
+
+class CassetteMiss(Exception):
+    #Replay was asked for a request that was never recorded
+    pass
+
+
+def request_key(method: str, args: tuple, kwargs: Dict) -> str:
+    return json.dumps({'method': method, 'args': args, 'kwargs': kwargs}, sort_keys=True, default=str)
+
+
+def serialize_response(result: Any) -> Any:
+    if hasattr(result, 'model_dump'):
+        return result.model_dump()
+    if hasattr(result, '__dict__'):
+        return vars(result)
+    return result
+
+
+def deserialize_response(payload: Any) -> Any:
+    # Callers read top-level attributes (result.html, result.data) and treat nested values as dicts
+    return SimpleNamespace(**payload) if isinstance(payload, dict) else payload
+
+
+class Cassette:
+    #Gzipped JSON lines of Firecrawl requests, responses and latencies
+
+    def __init__(self, path: str = CASSETTE_PATH, mode: str = REPLAY, simulate_timing: bool = CASSETTE_TIMING):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode: {mode}. Choose one of {', '.join(CASSETTE_MODES)}")
+
+        self.path = path
+        self.mode = mode
+        self.simulate_timing = simulate_timing
+        self.entries: Dict[str, Deque[Dict]] = defaultdict(deque)
+        self._file = None
+        self._started = False
+        self._lock = threading.Lock()
+
+        if mode == REPLAY:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                try:
+                    for line in f:
+                        entry = json.loads(line)
+                        self.entries[entry['key']].append(entry)
+                except (EOFError, ValueError):
+                    # A recording cut short by a crash still replays up to its last full entry
+                    pass
+
+    def _open(self) -> None:
+        # Opened on the first recorded call, not at import: spawned worker processes re-import the modules
+        # that build the key pool and would otherwise truncate the recording. Reopening after close appends.
+        self._file = gzip.open(self.path, 'at' if self._started else 'wt', encoding='utf-8')
+        if not self._started:
+            self._started = True
+            atexit.register(self.close)
+
+    def record(self, key: str, latency: float, response: Any = None, error: Optional[Exception] = None) -> None:
+        entry = {'key': key, 'latency': round(latency, 4)}
+        if error is not None:
+            status = getattr(error, 'status_code', None) or getattr(getattr(error, 'response', None), 'status_code', None)
+            entry['error'] = {
+                'type': type(error).__name__,
+                'types': [cls.__name__ for cls in type(error).__mro__],
+                'message': str(error),
+                'status_code': status,
+            }
+        else:
+            entry['response'] = serialize_response(response)
+
+        line = json.dumps(entry, ensure_ascii=False, default=str)
+        with self._lock:
+            if self._file is None:
+                self._open()
+            self._file.write(line + '\n')
+            self._file.flush()
+
+    def replay(self, key: str) -> Any:
+        #Serve recorded responses for a request in their original order, repeating the last one
+        with self._lock:
+            queue = self.entries.get(key)
+            if not queue:
+                raise CassetteMiss(f"No recorded response for {key}")
+            entry = queue.popleft() if len(queue) > 1 else queue[0]
+
+        if self.simulate_timing:
+            time.sleep(entry['latency'])
+        if 'error' in entry:
+            error = entry['error']
+            raise ReplayedError(error['message'], error.get('status_code'), error.get('type', 'Exception'),
+                                error.get('types'))
+        return deserialize_response(entry['response'])
+
+    def close(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+class CassetteApp:
+    #Wraps a FirecrawlApp so scrape/extract go through the cassette
+
+    def __init__(self, app: Any, cassette: Cassette):
+        self._app = app
+        self._cassette = cassette
+
+    def __getattr__(self, name: str) -> Any:
+        if name not in RECORDED_METHODS:
+            return getattr(self._app, name)
+
+        def call(*args, **kwargs):
+            key = request_key(name, args, kwargs)
+            if self._cassette.mode == REPLAY:
+                return self._cassette.replay(key)
+
+            start = time.perf_counter()
+            try:
+                result = getattr(self._app, name)(*args, **kwargs)
+            except Exception as e:
+                self._cassette.record(key, time.perf_counter() - start, error=e)
+                raise
+            self._cassette.record(key, time.perf_counter() - start, response=result)
+            return result
+
+        return call
+
+
+_active: Optional[Cassette] = None
+
+
+def active_cassette() -> Optional[Cassette]:
+    #The process-wide cassette configured through FIRECRAWL_CASSETTE_MODE, if any
+    global _active
+    if _active is None and CASSETTE_MODE:
+        _active = Cassette(CASSETTE_PATH, CASSETTE_MODE)
+    return _active
@@ -0,0 +1,101 @@
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+from firecrawl_pool import KeyPool, response_field
+from llm_fallback import JOB_SCHEMA, jobs_from_extract
+from retry_policy import call_with_retry
+from url_canon import canonicalize_url
+
+# Job pages per enrichment extract call
+ENRICH_BATCH_SIZE = int(os.getenv('SCRAPER_ENRICH_BATCH', '10'))
+
+ENRICH_CACHE_PATH = os.getenv('SCRAPER_ENRICH_CACHE', '.cache/enrichment.json')
+
+# Fields each parser fills with a constant instead of reading them from the page
+PARSER_DEFAULTS: Dict[str, Tuple[str, ...]] = {
+    'Workable': ('location', 'job_type'),
+    'DynamiteJobs': ('location', 'job_type'),
+    'Remotive': ('location', 'job_type'),
+    'Remote.co': ('location', 'job_type'),
+}
+
+ENRICHABLE_FIELDS = ('company', 'location', 'job_type')
+
+# Values parsers leave when they couldn't find a field
+PLACEHOLDERS = ('', 'N/A')
+
+
+def defaulted_fields(job) -> Tuple[str, ...]:
+    #Fields of a job holding a parser default or placeholder rather than a value read from the page
+    defaults = PARSER_DEFAULTS.get(job.get('source'), ())
+    return tuple(
+        field for field in ENRICHABLE_FIELDS
+        if field in defaults or (job.get(field) or '').strip() in PLACEHOLDERS
+    )
+
+
+def field_schema(fields: Sequence[str]) -> Dict:
+    #Reduced extract schema asking only for the given fields of each job page
+    job_properties = JOB_SCHEMA['properties']['jobs']['items']['properties']
+    properties = {'apply_url': {'type': 'string', 'description': "URL of the job page the values came from"}}
+    properties.update({field: job_properties[field] for field in fields})
+    return {
+        'type': 'object',
+        'properties': {
+            'jobs': {'type': 'array', 'items': {'type': 'object', 'properties': properties}}
+        }
+    }
+
+
+class EnrichmentCache:
+    #Canonical apply_url -> field values found by enrichment; None marks a field asked for and not found
+
+    def __init__(self, path: str = ENRICH_CACHE_PATH):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Optional[str]]] = {}
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.entries = json.load(f)
+
+    def get(self, url: str) -> Dict[str, Optional[str]]:
+        return self.entries.get(canonicalize_url(url), {})
+
+    def update(self, url: str, values: Dict[str, Optional[str]]) -> None:
+        with self._lock:
+            self.entries.setdefault(canonicalize_url(url), {}).update(values)
+
+    def save(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with self._lock:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+def extract_fields(pool: KeyPool, urls: List[str], fields: Sequence[str]) -> Optional[Dict[str, Dict[str, str]]]:
+    #One extract call over several job pages asking only for fields; url -> values found.
+    #None when the call itself failed, so nothing gets cached as not found.
+    schema = field_schema(fields)
+    result = call_with_retry(pool, lambda lane: lane.app.extract(urls=urls, schema=schema), url=urls[0])
+    if result is None:
+        return None
+
+    data = response_field(result, 'data')
+    if isinstance(data, list):
+        data = data[0] if data else None
+
+    by_url = {canonicalize_url(url): url for url in urls}
+    found: Dict[str, Dict[str, str]] = {}
+    for item in jobs_from_extract(data):
+        url = by_url.get(canonicalize_url(item.get('apply_url', '')))
+        if url is None and len(urls) == 1:
+            url = urls[0]
+        if url:
+            found.setdefault(url, {}).update({field: item[field].strip() for field in fields if field in item})
+    return found
@@ -0,0 +1,118 @@
+import csv
+import json
+import os
+import sys
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional
+from jobs import JOB_FIELDS, Job
+
+STREAM_FSYNC_BATCH = int(os.getenv('SCRAPER_STREAM_FSYNC_BATCH', '100'))
+
+PARQUET_DIR = os.getenv('SCRAPER_PARQUET_DIR', 'jobs_parquet')
+
+# Low-cardinality columns stored as dictionary-encoded categoricals
+CATEGORICAL_FIELDS = ['source', 'location', 'job_type', 'company']
+
+
+class JsonlWriter:
+    #Appends jobs as NDJSON while scraping; fsyncs every batch and renames into place on close.
+    #A path of '-' streams to stdout instead.
+
+    def __init__(self, path: str = 'jobs.jsonl', batch_size: int = STREAM_FSYNC_BATCH):
+        self.path = path
+        self.batch_size = batch_size
+        self.count = 0
+        self._pending = 0
+
+        if path == '-':
+            self.partial_path = None
+            self._file = sys.stdout
+        else:
+            # Anything already fsynced survives a crash in the .partial file
+            self.partial_path = f"{path}.partial"
+            self._file = open(self.partial_path, 'w', encoding='utf-8')
+
+    def write(self, jobs: Iterable[Job]) -> None:
+        for job in jobs:
+            self._file.write(json.dumps(job.to_dict(), ensure_ascii=False) + '\n')
+            self.count += 1
+            self._pending += 1
+            if self._pending >= self.batch_size:
+                self._sync()
+
+    def _sync(self) -> None:
+        self._file.flush()
+        if self.partial_path:
+            os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def close(self) -> None:
+        self._sync()
+        if self.partial_path:
+            self._file.close()
+            os.replace(self.partial_path, self.path)
+
+
+def iter_jsonl(path: str) -> Iterator[Dict]:
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def jsonl_to_json(source: str, filename: str = "jobs.json") -> None:
+    #Derive the pretty-printed JSON array from the stream, one record at a time
+    tmp_path = f"{filename}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as jsonfile:
+        first = True
+        for job in iter_jsonl(source):
+            body = json.dumps(job, indent=2, ensure_ascii=False).replace('\n', '\n  ')
+            jsonfile.write(('[\n  ' if first else ',\n  ') + body)
+            first = False
+        # Same layout json.dump(jobs, indent=2) produces
+        jsonfile.write('[]' if first else '\n]')
+    os.replace(tmp_path, filename)
+
+
+def jsonl_to_csv(source: str, filename: str = "jobs.csv", fieldnames: List[str] = JOB_FIELDS) -> int:
+    #Derive the CSV view from the stream; header-only when there are no jobs, so a previous run's view
+    #never outlives the stream it came from
+    count = 0
+    tmp_path = f"{filename}.tmp"
+    with open(tmp_path, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction='ignore')
+        writer.writeheader()
+        for row in iter_jsonl(source):
+            writer.writerow(row)
+            count += 1
+    os.replace(tmp_path, filename)
+    return count
+
+
+def jobs_dataframe(jobs: Iterable[Dict], run_date: Optional[str] = None):
+    #Typed DataFrame of jobs: categoricals for repetitive columns, strings for the rest
+    import pandas as pd
+
+    df = pd.DataFrame.from_records(list(jobs), columns=JOB_FIELDS)
+    for field in JOB_FIELDS:
+        dtype = 'category' if field in CATEGORICAL_FIELDS else 'string'
+        df[field] = df[field].astype(dtype)
+    df['run_date'] = run_date or date.today().isoformat()
+    return df
+
+
+def export_to_parquet(jobs: Iterable[Dict], root: str = PARQUET_DIR, run_date: Optional[str] = None) -> int:
+    #Write jobs as Parquet partitioned by run_date and source (root/run_date=.../source=.../*.parquet).
+    #Re-running on the same day replaces that day's partitions instead of appending to them.
+    df = jobs_dataframe(jobs, run_date)
+    if df.empty:
+        return 0
+
+    df.to_parquet(
+        root,
+        engine='pyarrow',
+        index=False,
+        partition_cols=['run_date', 'source'],
+        existing_data_behavior='delete_matching',
+    )
+    return len(df)
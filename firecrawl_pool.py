@@ -0,0 +1,137 @@
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Optional
+from dotenv import load_dotenv
+from firecrawl import FirecrawlApp
+from cassette import REPLAY, CassetteApp, active_cassette
+from rate_control import DomainLimiter, TokenBucket
+
+# Configuration
+load_dotenv()
+
+# Per-key lane limits
+KEY_REQUESTS_PER_MINUTE = float(os.getenv('FIRECRAWL_KEY_RPM', '60'))
+KEY_MAX_IN_FLIGHT = int(os.getenv('FIRECRAWL_KEY_CONCURRENCY', '2'))
+
+# Alternate API endpoint, e.g. the local fake server used for load tests
+FIRECRAWL_API_URL = os.getenv('FIRECRAWL_API_URL')
+
+
+def load_api_keys() -> List[str]:
+    #Read the configured Firecrawl API keys from the environment
+    # FIRECRAWL_API_KEY, then FIRECRAWL_API_KEY_1 ... FIRECRAWL_API_KEY_5
+    keys = [
+        os.getenv(f'FIRECRAWL_API_KEY{"" if i == 0 else f"_{i}"}')
+        for i in range(0, 6)
+    ]
+    return list(dict.fromkeys(key for key in keys if key))
+
+
+def response_field(response: Any, name: str) -> Any:
+    #Read a field from an SDK response object, or from the plain dicts cassettes and nested payloads hold
+    if isinstance(response, dict):
+        return response.get(name)
+    return getattr(response, name, None)
+
+
+class KeyLane:
+    #One API key with its own client, adaptive token bucket and in-flight counter
+
+    def __init__(self, api_key: str, requests_per_minute: float):
+        self.api_key = api_key
+        self.app = FirecrawlApp(api_key=api_key, api_url=FIRECRAWL_API_URL) if FIRECRAWL_API_URL else FirecrawlApp(api_key=api_key)
+        cassette = active_cassette()
+        if cassette:
+            self.app = CassetteApp(self.app, cassette)
+        self.in_flight = 0
+        self.parked_until = 0.0
+        self.bucket = TokenBucket(requests_per_minute)
+
+
+class KeyPool:
+    #Dispatches requests to the least-loaded healthy API key
+
+    def __init__(self, api_keys: List[str], requests_per_minute: float = KEY_REQUESTS_PER_MINUTE,
+                 max_in_flight: int = KEY_MAX_IN_FLIGHT):
+        if not api_keys:
+            raise ValueError("No API keys found. Please configure FIRECRAWL_API_KEY in .env file")
+
+        self.lanes = [KeyLane(key, requests_per_minute) for key in api_keys]
+        self.max_in_flight = max_in_flight
+        self.domains = DomainLimiter()
+        self._cond = threading.Condition()
+
+    @classmethod
+    def from_env(cls) -> 'KeyPool':
+        #Build a pool from the keys configured in .env
+        keys = load_api_keys()
+        cassette = active_cassette()
+        if not keys and cassette and cassette.mode == REPLAY:
+            # Replaying needs no real credentials
+            keys = ['replay']
+        return cls(keys)
+
+    def __len__(self) -> int:
+        return len(self.lanes)
+
+    def healthy_lanes(self) -> List[KeyLane]:
+        now = time.monotonic()
+        return [lane for lane in self.lanes if lane.parked_until <= now]
+
+    def acquire(self) -> KeyLane:
+        #Reserve the least-loaded healthy key, blocking while every key is saturated
+        with self._cond:
+            while True:
+                candidates = [lane for lane in self.healthy_lanes() if lane.in_flight < self.max_in_flight]
+                if candidates:
+                    lane = min(candidates, key=lambda l: (l.in_flight, l.bucket.delay()))
+                    lane.in_flight += 1
+                    return lane
+                if not self.healthy_lanes():
+                    wake_at = min(lane.parked_until for lane in self.lanes)
+                    if math.isinf(wake_at):
+                        raise RuntimeError("All API keys are exhausted")
+                    self._cond.wait(wake_at - time.monotonic())
+                else:
+                    self._cond.wait()
+
+    def retain(self, lane: KeyLane) -> None:
+        #Keep one of a key's slots taken after its request returns, while the async job it started runs;
+        #give it back with release()
+        with self._cond:
+            lane.in_flight += 1
+
+    def release(self, lane: KeyLane) -> None:
+        with self._cond:
+            lane.in_flight -= 1
+            self._cond.notify()
+
+    def park(self, lane: KeyLane, seconds: Optional[float] = None) -> None:
+        #Stop dispatching to a key for a while, or for the rest of the run once its credits run out
+        with self._cond:
+            lane.parked_until = math.inf if seconds is None else time.monotonic() + seconds
+            self._cond.notify_all()
+
+    @contextmanager
+    def lane(self, url: Optional[str] = None) -> Iterator[KeyLane]:
+        #Hold a key for one request once both the target domain and the key have a token
+        if url:
+            self.domains.bucket_for(url).acquire()
+        lane = self.acquire()
+        try:
+            lane.bucket.acquire()
+            yield lane
+        finally:
+            self.release(lane)
+
+    def record_success(self, lane: KeyLane, url: Optional[str] = None) -> None:
+        lane.bucket.on_success()
+        if url:
+            self.domains.bucket_for(url).on_success()
+
+    def record_rate_limited(self, lane: KeyLane, retry_after: Optional[float] = None) -> float:
+        #Slow the key down after a 429; returns how long its next request is held
+        return lane.bucket.on_rate_limited(retry_after)
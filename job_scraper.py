@@ -1,254 +1,566 @@
 import os
 import json
 import csv
-import re
+import sys
 import time
-from typing import List, Dict, Optional
+import asyncio
+import argparse
+from contextlib import nullcontext, redirect_stdout
+from dataclasses import replace
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from types import SimpleNamespace
+from typing import AbstractSet, AsyncIterator, Awaitable, Callable, Iterable, Iterator, List, Dict, Optional, Set, Tuple
 from dotenv import load_dotenv
-from firecrawl import FirecrawlApp
-from bs4 import BeautifulSoup
+from firecrawl_pool import KeyPool, response_field
+from parsers import (
+    extract_job_data, parse_dynamitejobs, parse_dynamitejobs_last_page, parse_mercor,
+    parse_remoteco_category, parse_remotive, parse_workable
+)
+from retry_policy import RetryPolicy, call_with_retry, poll_with_retry, retry_stats
+from response_cache import CACHE_MODES, CACHE_OFFLINE, CACHE_USE, ExtractCache, ResponseCache
+from seen_index import SeenIndex
+from job_store import JobStore, utc_now
+from jobs import JOB_FIELDS, Job
+from url_canon import canonicalize_url
+from enrichment import ENRICH_BATCH_SIZE, EnrichmentCache, defaulted_fields, extract_fields
+from llm_fallback import JOB_SCHEMA, LLM_FALLBACK, completeness, escalation_reason, jobs_from_extract, text_fingerprint
+from exporters import PARQUET_DIR, JsonlWriter, export_to_parquet, jsonl_to_csv, jsonl_to_json
 
 # Configuration
 load_dotenv()
 
 # API Key Management
-API_KEYS = [
-    os.getenv(f'FIRECRAWL_API_KEY{"" if i == 0 else f"_{i}"}')
-    for i in range(1, 6)
-]
-API_KEYS = [key for key in API_KEYS if key]
+key_pool = KeyPool.from_env()
 
-if not API_KEYS:
-    raise ValueError("No API keys found. Please configure FIRECRAWL_API_KEY in .env file")
+# Scrape results are cached on disk between runs
+response_cache = ResponseCache()
 
-current_key_index = 0
-app = FirecrawlApp(api_key=API_KEYS[current_key_index])
+# LLM extracts of pages the parsers handled poorly, reused while the page text is unchanged
+extract_cache = ExtractCache()
+fallback_stats = {'escalated': 0, 'replaced': 0}
 
+# Field values filled in by LLM enrichment, kept per apply_url across runs
+enrichment_cache: Optional[EnrichmentCache] = None
+enrich_stats = {'calls': 0, 'fields': 0, 'enriched': 0}
 
-def rotate_api_key() -> None:
-    #Rotate to the next available API key
-    global current_key_index, app
-    current_key_index = (current_key_index + 1) % len(API_KEYS)
-    app = FirecrawlApp(api_key=API_KEYS[current_key_index])
+# Engine Configuration
+MAX_CONCURRENCY = int(os.getenv('SCRAPER_CONCURRENCY', '8'))
+
+# DynamiteJobs paging depth and job cap
+DYNAMITE_MAX_PAGES = int(os.getenv('SCRAPER_DYNAMITE_MAX_PAGES', '50'))
+DYNAMITE_MAX_JOBS = int(os.getenv('SCRAPER_DYNAMITE_MAX_JOBS', '200'))
+# Pages fetched past those the job cap needs at page 1's yield, in case some pages come back short
+DYNAMITE_PAGE_MARGIN = int(os.getenv('SCRAPER_DYNAMITE_PAGE_MARGIN', '1'))
+
+# Pages in flight at once while an incremental run looks for the first all-known page
+INCREMENTAL_WINDOW = int(os.getenv('SCRAPER_INCREMENTAL_WINDOW', '2'))
+
+# Multi-URL sources go through one Firecrawl batch scrape, polled until every page is in
+BATCH_SCRAPE = os.getenv('SCRAPER_BATCH_SCRAPE', '1') != '0'
+BATCH_POLL_SECONDS = float(os.getenv('SCRAPER_BATCH_POLL_SECONDS', '2'))
+BATCH_TIMEOUT = float(os.getenv('SCRAPER_BATCH_TIMEOUT', '300'))
+BATCH_DONE_STATES = {'completed', 'failed', 'cancelled'}
+
+PARSER_WORKERS = int(os.getenv('SCRAPER_PARSER_WORKERS', str(os.cpu_count() or 1)))
+PARSE_QUEUE_SIZE = int(os.getenv('SCRAPER_PARSE_QUEUE', '16'))
+
+Parser = Callable[[str], List[Job]]
+
+# Source adapters are async generators yielding jobs a page (or category) at a time
+JobBatches = AsyncIterator[List[Job]]
+
+# Bounds in-flight fetches across every source; created by run_scrapers
+_fetch_slots: Optional[asyncio.Semaphore] = None
+_parse_stage: Optional['ParseStage'] = None
+
+
+class ParseStage:
+    #Bounded queue of fetched pages drained by a process pool of parser workers
+    
+    def __init__(self, workers: int = PARSER_WORKERS, queue_size: int = PARSE_QUEUE_SIZE):
+        self.workers = max(1, workers)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        self.consumers: List[asyncio.Task] = []
+    
+    def start(self) -> None:
+        self.consumers = [asyncio.create_task(self._consume()) for _ in range(self.workers)]
+    
+    async def parse(self, parser: Callable, html: str, *args) -> object:
+        #Queue a page for parsing; waits for room in the queue when parsers fall behind
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((parser, (html, *args), future))
+        return await future
+    
+    async def _consume(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            parser, args, future = await self.queue.get()
+            try:
+                jobs = await loop.run_in_executor(self.executor, parser, *args)
+            except Exception as e:
+                if not future.cancelled():
+                    future.set_exception(e)
+            else:
+                if not future.cancelled():
+                    future.set_result(jobs)
+            finally:
+                self.queue.task_done()
+    
+    async def close(self) -> None:
+        for consumer in self.consumers:
+            consumer.cancel()
+        await asyncio.gather(*self.consumers, return_exceptions=True)
+        self.executor.shutdown()
 
 
 def scrape_with_retry(url: str, formats: List[str], max_retries: int = 3) -> Optional[object]:
-    #Scrape a URL with automatic retry and API key rotation on rate limits
-    for attempt in range(max_retries * len(API_KEYS)):
-        try:
-            return app.scrape(url, formats=formats)
-        except Exception as e:
-            if 'rate limit' in str(e).lower() or '429' in str(e):
-                rotate_api_key()
-                continue
-            return None
-    return None
+    #Scrape a URL, backing off and moving between keys according to the error class
+    cached = response_cache.get(url, formats)
+    if cached is not None or response_cache.mode == CACHE_OFFLINE:
+        return cached
+    
+    policy = RetryPolicy(max_attempts=max_retries * len(key_pool))
+    result = call_with_retry(key_pool, lambda lane: lane.app.scrape(url, formats=formats), url=url, policy=policy)
+    if result is not None:
+        response_cache.put(url, formats, result)
+    return result
 
 
-def extract_job_data(job_data: Dict, source: str) -> Optional[Dict]:
-    #Validate and format job data
-    if not job_data.get('title') or not job_data.get('apply_url'):
+async def fetch_html(url: str) -> Optional[str]:
+    #Fetch a page's HTML on a worker thread within the global concurrency limit
+    async with _fetch_slots:
+        result = await asyncio.to_thread(scrape_with_retry, url, ['html'])
+    
+    if not result or not hasattr(result, 'html'):
         return None
+    return result.html
+
+
+def extract_with_llm(url: str, html: str, source: str) -> Optional[List[Job]]:
+    #LLM extract of a page; None when it failed or, offline, wasn't cached
+    fingerprint = text_fingerprint(html)
+    data = extract_cache.get(url, JOB_SCHEMA, fingerprint)
+    if data is None:
+        if response_cache.mode == CACHE_OFFLINE:
+            return None
+        result = call_with_retry(key_pool, lambda lane: lane.app.extract(urls=[url], schema=JOB_SCHEMA), url=url)
+        data = response_field(result, 'data') if result else None
+        if isinstance(data, list):
+            data = data[0] if data else None
+        if not data:
+            return None
+        extract_cache.put(url, JOB_SCHEMA, fingerprint, data)
     
-    return {
-        'title': job_data['title'].strip(),
-        'company': job_data.get('company', 'N/A').strip(),
-        'location': job_data.get('location', 'Remote').strip(),
-        'job_type': job_data.get('job_type', 'Full-time').strip(),
-        'apply_url': job_data['apply_url'].strip(),
-        'source': source
-    }
+    jobs = (extract_job_data(job_data, source) for job_data in jobs_from_extract(data))
+    return [job for job in jobs if job]
 
 
-def scrape_workable() -> List[Dict]:
-    #Scrape jobs from Workable
-    jobs = []
-    url = "https://jobs.workable.com/search?location=Pātan%2C+Nepal"
+async def with_fallback(url: str, html: str, source: str, jobs: List[Job],
+                        expect_jobs: bool = True, skipped: int = 0) -> List[Job]:
+    #Keep the parser's jobs unless they miss the source's yield or completeness threshold;
+    #then extract the page with the LLM and keep whichever result is better
+    reason = escalation_reason(source, jobs, expect_jobs, skipped) if LLM_FALLBACK else ''
+    if not reason:
+        return jobs
     
-    result = scrape_with_retry(url, formats=['html'])
-    if not result or not hasattr(result, 'html'):
+    fallback_stats['escalated'] += 1
+    async with _fetch_slots:
+        extracted = await asyncio.to_thread(extract_with_llm, url, html, source)
+    if not extracted or (len(extracted), completeness(extracted, source)) <= (len(jobs), completeness(jobs, source)):
+        print(f"  {source}: parser {reason} on {url}; LLM extract did no better")
         return jobs
     
-    soup = BeautifulSoup(result.html, 'html.parser')
-    job_links = soup.find_all('a', href=re.compile(r'/view/'))
+    fallback_stats['replaced'] += 1
+    print(f"  {source}: parser {reason} on {url}; using {len(extracted)} jobs from LLM extract")
+    return extracted
+
+
+async def enrich_jobs(jobs: List[Job], request_missing: bool = True) -> List[Job]:
+    #Replace defaulted fields with LLM-read values, requesting only fields not cached for each apply_url;
+    #jobs missing the same fields share a reduced-schema extract call per ENRICH_BATCH_SIZE pages.
+    #Without request_missing only cached values are applied, which costs no calls.
+    wanted: Dict[Tuple[str, ...], List[str]] = {}
+    for job in jobs:
+        cached = enrichment_cache.get(job.apply_url)
+        fields = tuple(field for field in defaulted_fields(job) if field not in cached)
+        if fields:
+            wanted.setdefault(fields, []).append(job.apply_url)
     
-    for link in job_links[:150]:
-        title = link.get_text(strip=True)
-        if not title or len(title) < 5:
-            continue
-        
-        job_url = link.get('href', '')
-        if job_url and not job_url.startswith('http'):
-            job_url = f"https://jobs.workable.com{job_url}"
-        
-        # Extract company from URL pattern
-        company = "N/A"
-        if '-at-' in job_url:
-            parts = job_url.split('/')[-1].split('-at-')
-            if len(parts) > 1:
-                company = parts[-1].replace('-', ' ').title()
-        
-        job = extract_job_data({
-            'title': title,
-            'company': company,
-            'location': 'Remote',
-            'job_type': 'Full-time',
-            'apply_url': job_url
-        }, 'Workable')
-        
-        if job:
-            jobs.append(job)
+    async def request(fields: Tuple[str, ...], urls: List[str]) -> None:
+        async with _fetch_slots:
+            found = await asyncio.to_thread(extract_fields, key_pool, urls, fields)
+        enrich_stats['calls'] += 1
+        enrich_stats['fields'] += len(fields) * len(urls)
+        if found is None:
+            return
+        for url in urls:
+            values = found.get(url, {})
+            enrichment_cache.update(url, {field: values.get(field) for field in fields})
+    
+    if request_missing and response_cache.mode != CACHE_OFFLINE:
+        await asyncio.gather(*(
+            request(fields, urls[i:i + ENRICH_BATCH_SIZE])
+            for fields, urls in wanted.items()
+            for i in range(0, len(urls), ENRICH_BATCH_SIZE)
+        ))
     
-    return jobs
+    enriched = []
+    for job in jobs:
+        cached = enrichment_cache.get(job.apply_url)
+        values = {field: cached[field] for field in defaulted_fields(job) if cached.get(field)}
+        if values:
+            enrich_stats['enriched'] += 1
+            job = replace(job, **values)
+        enriched.append(job)
+    return enriched
+
+
+async def fetch_jobs(url: str, parser: Parser, source: str, expect_jobs: bool = True) -> Optional[List[Job]]:
+    #Fetch a page and hand it to the parse stage, falling back to LLM extract for poor results;
+    #None when the fetch failed
+    html = await fetch_html(url)
+    if not html:
+        return None
+    return await with_fallback(url, html, source, await _parse_stage.parse(parser, html), expect_jobs)
 
 
-def scrape_dynamitejobs() -> List[Dict]:
-    #Scrape jobs from DynamiteJobs
-    jobs = []
+def document_url(document: object) -> Optional[str]:
+    metadata = response_field(document, 'metadata') or {}
+    for name in ('source_url', 'sourceURL', 'url'):
+        url = response_field(metadata, name)
+        if url:
+            return url
+    return None
+
+
+def start_batch_scrape(urls: List[str], formats: List[str]) -> Optional[Tuple[object, str]]:
+    #Submit a batch scrape; returns the key lane it went to, which must also poll it, and the job id
+    def submit(lane):
+        return lane, response_field(lane.app.start_batch_scrape(urls, formats=formats), 'id')
     
-    for page in range(1, 51):
-        url = f"https://dynamitejobs.com/remote-jobs{'?page=' + str(page) if page > 1 else ''}"
-        
-        result = scrape_with_retry(url, formats=['html'])
-        if not result or not hasattr(result, 'html'):
-            continue
-        
-        soup = BeautifulSoup(result.html, 'html.parser')
-        h2_elements = [h2 for h2 in soup.find_all('h2') if h2.get('href') and '/remote-job/' in h2.get('href')]
-        
-        for h2 in h2_elements:
-            title = h2.get_text(strip=True)
-            if not title or len(title) < 5:
-                continue
-            
-            job_url = h2.get('href', '')
-            if job_url and not job_url.startswith('http'):
-                job_url = f"https://dynamitejobs.com{job_url}"
-            
-            # Extract company from next sibling
-            company = "N/A"
-            next_p = h2.find_next_sibling('p')
-            if next_p:
-                company = next_p.get_text(strip=True)
+    submitted = call_with_retry(key_pool, submit)
+    return submitted if submitted and submitted[1] else None
+
+
+def poll_batch_scrape(lane, job_id: str, deadline: float) -> Optional[object]:
+    #Current status of a batch scrape with every page finished so far; None once polling has failed for good
+    return poll_with_retry(key_pool, lane, lambda lane: lane.app.get_batch_scrape_status(job_id), deadline)
+
+
+async def fetch_html_batch(urls: List[str]) -> AsyncIterator[Tuple[str, Optional[str]]]:
+    #Yield (url, html) as pages arrive: cached pages first, then one batch scrape for the rest,
+    #then per-URL scrapes for anything the batch didn't deliver; html is None for pages that failed
+    formats = ['html']
+    pending = []
+    for url in urls:
+        cached = response_cache.get(url, formats)
+        if cached is not None or response_cache.mode == CACHE_OFFLINE:
+            yield url, getattr(cached, 'html', None)
+        else:
+            pending.append(url)
+    
+    submitted = None
+    if BATCH_SCRAPE and len(pending) > 1:
+        async with _fetch_slots:
+            submitted = await asyncio.to_thread(start_batch_scrape, pending, formats)
+    
+    if submitted:
+        lane, job_id = submitted
+        remaining = {canonicalize_url(url): url for url in pending}
+        deadline = time.monotonic() + BATCH_TIMEOUT
+        while remaining and time.monotonic() < deadline:
+            await asyncio.sleep(BATCH_POLL_SECONDS)
+            status = await asyncio.to_thread(poll_batch_scrape, lane, job_id, deadline)
+            if status is None:
+                break
             
-            job = extract_job_data({
-                'title': title,
-                'company': company,
-                'location': 'Remote',
-                'job_type': 'Full-time',
-                'apply_url': job_url
-            }, 'DynamiteJobs')
+            # Each poll returns every finished page; hand on the ones not seen yet
+            for document in response_field(status, 'data') or []:
+                url = remaining.get(canonicalize_url(document_url(document) or ''))
+                html = response_field(document, 'html')
+                if url and html:
+                    del remaining[canonicalize_url(url)]
+                    response_cache.put(url, formats, SimpleNamespace(html=html))
+                    yield url, html
             
-            if job:
-                jobs.append(job)
-        
-        time.sleep(2)
-        
-        if len(jobs) >= 200:
-            break
+            if response_field(status, 'status') in BATCH_DONE_STATES:
+                break
+        pending = list(remaining.values())
+        if pending:
+            print(f"Batch scrape {job_id} missed {len(pending)} page(s); scraping them one by one")
     
-    return jobs
+    # Per-URL fallback, concurrently within the fetch slots
+    async def fetch_one(url: str) -> Tuple[str, Optional[str]]:
+        return url, await fetch_html(url)
+    
+    tasks = [asyncio.create_task(fetch_one(url)) for url in pending]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            yield await finished
+    finally:
+        for task in tasks:
+            task.cancel()
 
 
-def scrape_remotive() -> List[Dict]:
-    #Scrape jobs from Remotive
-    jobs = []
-    url = "https://remotive.com/remote-jobs"
+async def fetch_parsed(urls: List[str], parse: Callable[[str, str], Awaitable]) -> AsyncIterator[Tuple[str, object]]:
+    #Batch-fetch urls and parse each page as soon as it arrives; yields (url, parsed) in completion
+    #order, with None for pages that couldn't be fetched
+    async def parse_page(url: str, html: Optional[str]) -> Tuple[str, object]:
+        return url, (await parse(url, html) if html else None)
     
-    result = scrape_with_retry(url, formats=['html'])
-    if not result or not hasattr(result, 'html'):
-        return jobs
+    tasks: Set[asyncio.Task] = set()
+    try:
+        async for url, html in fetch_html_batch(urls):
+            tasks.add(asyncio.create_task(parse_page(url, html)))
+            for task in [task for task in tasks if task.done()]:
+                tasks.discard(task)
+                yield task.result()
+        for finished in asyncio.as_completed(tasks):
+            yield await finished
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def scrape_workable() -> JobBatches:
+    #Scrape jobs from Workable
+    jobs = await fetch_jobs("https://jobs.workable.com/search?location=Pātan%2C+Nepal", parse_workable, 'Workable')
+    if jobs:
+        yield jobs
+
+
+def dynamitejobs_url(page: int) -> str:
+    return f"https://dynamitejobs.com/remote-jobs{'?page=' + str(page) if page > 1 else ''}"
+
+
+def has_new_jobs(jobs: Optional[List[Job]], seen: Set[str]) -> bool:
+    #A page past the end is empty or repeats listings we already have
+    return bool(jobs) and any(job.apply_url not in seen for job in jobs)
+
+
+def first_repeat_page(page_jobs: Dict[int, List[Job]]) -> Optional[int]:
+    #Lowest fetched page that is empty or only repeats listings from earlier pages
+    first_seen: Set[str] = set()
+    for page in sorted(page_jobs):
+        jobs = page_jobs[page]
+        if not has_new_jobs(jobs, first_seen):
+            return page
+        first_seen.update(job.apply_url for job in jobs)
+    return None
+
+
+async def discover_dynamitejobs_last_page(limit: int, page_jobs: Dict[int, List[Job]],
+                                          seen: Set[str]) -> Optional[int]:
+    #Exponential probe for a page past the end, then binary search back to the last real page;
+    #None when every page probed up to limit is real, so the site is at least that long
+    last_good, probe = 1, 2
+    while probe <= limit:
+        jobs = await fetch_jobs(dynamitejobs_url(probe), parse_dynamitejobs, 'DynamiteJobs', expect_jobs=False)
+        if not has_new_jobs(jobs, seen):
+            break
+        page_jobs[probe] = jobs
+        seen.update(job.apply_url for job in jobs)
+        last_good, probe = probe, probe * 2
+    else:
+        return None
     
-    soup = BeautifulSoup(result.html, 'html.parser')
-    job_links = soup.find_all('a', href=re.compile(r'/remote-jobs/[^/]+/[^/]+-\d+$'))
+    first_bad = probe
+    while first_bad - last_good > 1:
+        middle = (last_good + first_bad) // 2
+        jobs = await fetch_jobs(dynamitejobs_url(middle), parse_dynamitejobs, 'DynamiteJobs', expect_jobs=False)
+        if has_new_jobs(jobs, seen):
+            page_jobs[middle] = jobs
+            seen.update(job.apply_url for job in jobs)
+            last_good = middle
+        else:
+            first_bad = middle
     
-    for link in job_links[:150]:
-        title_text = link.get_text(strip=True)
-        title = title_text
-        company = "N/A"
-        
-        # Extract company from title (format: "Title • Company")
-        if '•' in title_text:
-            parts = title_text.split('•')
-            title = parts[0].strip()
-            if len(parts) > 1:
-                company = parts[1].strip()
-        
-        job_url = link.get('href', '')
-        if job_url and not job_url.startswith('http'):
-            job_url = f"https://remotive.com{job_url}"
-        
-        if job_url.count('/') <= 4:
-            continue
-        
-        job = extract_job_data({
-            'title': title,
-            'company': company,
-            'location': 'Remote',
-            'job_type': 'Full-time',
-            'apply_url': job_url
-        }, 'Remotive')
-        
-        if job:
-            jobs.append(job)
+    return last_good
+
+
+def first_settled_page(page_jobs: Dict[int, List[Job]], known: AbstractSet[str]) -> Optional[int]:
+    #Lowest fetched page whose listings were all seen in previous runs
+    for page in sorted(page_jobs):
+        jobs = page_jobs[page]
+        if jobs and all(job.apply_url in known for job in jobs):
+            return page
+    return None
+
+
+async def feed_batch(batch: Dict[int, asyncio.Future]) -> None:
+    #Resolve each page's future with its parsed jobs as the batch scrape delivers it
+    pages = {dynamitejobs_url(page): page for page in batch}
     
-    return jobs[:150]
+    async def parse_page(url: str, html: str) -> List[Job]:
+        jobs = await _parse_stage.parse(parse_dynamitejobs, html)
+        return await with_fallback(url, html, 'DynamiteJobs', jobs, expect_jobs=False)
+    
+    try:
+        async for url, jobs in fetch_parsed(list(pages), parse_page):
+            future = batch[pages[url]]
+            if not future.done():
+                future.set_result(jobs)
+    finally:
+        # Pages never delivered count as failed fetches
+        for future in batch.values():
+            if not future.done():
+                future.set_result(None)
 
 
-def scrape_mercor() -> List[Dict]:
-    #Scrape jobs from Mercor
-    jobs = []
-    url = "https://work.mercor.com/explore"
+async def scrape_dynamitejobs(max_pages: int = DYNAMITE_MAX_PAGES, max_jobs: int = DYNAMITE_MAX_JOBS,
+                              known: AbstractSet[str] = frozenset(), window: Optional[int] = None) -> JobBatches:
+    #Scrape jobs from DynamiteJobs, yielding pages in order once every earlier page is settled;
+    #with known URLs, stop paging at the first page holding nothing new
+    first_page = await fetch_html(dynamitejobs_url(1))
+    if not first_page:
+        return
     
-    result = scrape_with_retry(url, formats=['html'])
-    if not result or not hasattr(result, 'html'):
-        return jobs
+    jobs = await _parse_stage.parse(parse_dynamitejobs, first_page)
+    page_jobs: Dict[int, List[Job]] = {1: await with_fallback(dynamitejobs_url(1), first_page, 'DynamiteJobs', jobs)}
+    seen = {job.apply_url for job in page_jobs[1]}
     
-    soup = BeautifulSoup(result.html, 'html.parser')
-    job_cards = soup.find_all('a', href=re.compile(r'listingId='))
+    # Pages the job cap needs if every page lists as many jobs as the first, plus a margin
+    per_page = len(page_jobs[1])
+    cap_pages = -(-max_jobs // max(1, per_page)) + DYNAMITE_PAGE_MARGIN
     
-    for card in job_cards[:150]:
-        title_elem = card.find('h2')
-        if not title_elem:
-            continue
-        
-        title = title_elem.get_text(strip=True)
-        if not title or len(title) < 5:
-            continue
-        
-        job_url = card.get('href', '')
-        if job_url and not job_url.startswith('http'):
-            job_url = f"https://work.mercor.com{job_url}"
-        
-        # Extract metadata
-        location = "Remote"
-        job_type = "Contract"
-        
-        metadata_divs = card.find_all('div', class_=re.compile(r'flex.*items-center.*gap-1.*text-sm'))
-        for div in metadata_divs:
-            text = div.get_text(strip=True)
-            if any(kw in text for kw in ['Remote', 'Worldwide']):
-                location = text
-            elif 'full-time' in text.lower():
-                job_type = "Full-time"
-        
-        job = extract_job_data({
-            'title': title,
-            'company': 'Mercor',
-            'location': location,
-            'job_type': job_type,
-            'apply_url': job_url
-        }, 'Mercor')
-        
-        if job:
-            jobs.append(job)
+    # The pager links a window of pages around the current one, so its highest number only proves the site
+    # is at least that long; the end shows up as the first empty or repeating page
+    stop_after = max_pages if per_page else 1
+    linked = parse_dynamitejobs_last_page(first_page)
+    if per_page and linked is None and not known:
+        # Incremental runs usually stop within a page or two, so probing would cost more than it saves
+        end = await discover_dynamitejobs_last_page(min(max_pages, cap_pages), page_jobs, seen)
+        stop_after = end if end is not None else max_pages
+    if known and first_settled_page(page_jobs, known) == 1:
+        stop_after = 1
     
-    return jobs[:150]
+    tasks: Dict[asyncio.Task, int] = {}
+    next_page = 2
+    
+    def finished(page: int) -> bool:
+        # Fetched, or launched and failed
+        return page in page_jobs or (page < next_page and page not in tasks.values())
+    
+    def known_through() -> int:
+        # Highest page known to exist, from the pager or a page that came back with jobs
+        return max([linked or 1] + [page for page, jobs in page_jobs.items() if jobs])
+    
+    def wanted_through() -> int:
+        # Last page worth having in flight: pages not back yet count as per_page jobs towards the cap,
+        # so pages go out in order only as far as the cap needs and the window grows as short pages arrive
+        expected, page = 0, 0
+        while page < stop_after and expected < max_jobs:
+            page += 1
+            if page in page_jobs:
+                expected += len(page_jobs[page])
+            elif not finished(page):
+                expected += per_page
+        return min(stop_after, page + DYNAMITE_PAGE_MARGIN)
+    
+    # Full crawls send the pages the job cap needs, among those known to exist, as one batch;
+    # pages it misses, or beyond it, are fetched one by one as the window moves on
+    batch: Dict[int, asyncio.Future] = {}
+    feeder: Optional[asyncio.Task] = None
+    if window is None and BATCH_SCRAPE:
+        pages = [page for page in range(2, min(wanted_through(), known_through()) + 1) if page not in page_jobs]
+        if len(pages) > 1:
+            loop = asyncio.get_running_loop()
+            batch = {page: loop.create_future() for page in pages}
+            feeder = asyncio.create_task(feed_batch(batch))
+    
+    async def fetch_page(page: int) -> Tuple[int, Optional[List[Job]]]:
+        if page in batch:
+            return page, await batch[page]
+        return page, await fetch_jobs(dynamitejobs_url(page), parse_dynamitejobs, 'DynamiteJobs', expect_jobs=False)
+    
+    # Remaining pages go in flight in page order, as far as the job cap needs and up to the window if one
+    # is set. A scrape already running in a thread can't be cancelled, so at most DYNAMITE_PAGE_MARGIN + 1
+    # pages past the last one known to exist are in flight at once.
+    def launch() -> None:
+        nonlocal next_page
+        while next_page <= wanted_through() and (window is None or len(tasks) < window):
+            beyond = sum(1 for page in tasks.values() if page > known_through())
+            if next_page > known_through() and beyond > DYNAMITE_PAGE_MARGIN:
+                break
+            if next_page not in page_jobs:
+                tasks[asyncio.create_task(fetch_page(next_page))] = next_page
+            next_page += 1
+    
+    next_emit, emitted = 1, 0
+    launch()
+    try:
+        while True:
+            # Hand over the leading run of finished pages; stop_after never drops below them
+            while next_emit <= stop_after and emitted < max_jobs and finished(next_emit):
+                jobs = page_jobs.get(next_emit)
+                next_emit += 1
+                if jobs:
+                    emitted += len(jobs)
+                    yield jobs
+            
+            if not tasks or emitted >= max_jobs:
+                break
+            
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                del tasks[task]
+                page, jobs = task.result()
+                if jobs is not None:
+                    page_jobs[page] = jobs
+            
+            # Pages past the end come back empty or repeating an earlier page
+            repeat = first_repeat_page(page_jobs)
+            if repeat is not None:
+                stop_after = min(stop_after, repeat - 1)
+            
+            # Known listings are still returned so their last_seen gets refreshed
+            if known:
+                settled = first_settled_page(page_jobs, known)
+                if settled is not None:
+                    stop_after = min(stop_after, settled)
+            
+            # Stop once the leading run of finished pages already fills the job cap
+            collected = 0
+            for page in range(1, stop_after + 1):
+                if not finished(page):
+                    break
+                collected += len(page_jobs.get(page, []))
+                if collected >= max_jobs:
+                    stop_after = page
+                    break
+            
+            for task, page in list(tasks.items()):
+                if page > stop_after:
+                    task.cancel()
+                    del tasks[task]
+            
+            launch()
+    finally:
+        # Consumer stopped early or paging is done; nothing left in flight should outlive us
+        for task in tasks:
+            task.cancel()
+        if feeder:
+            feeder.cancel()
+
+
+async def scrape_remotive() -> JobBatches:
+    #Scrape jobs from Remotive
+    jobs = await fetch_jobs("https://remotive.com/remote-jobs", parse_remotive, 'Remotive')
+    if jobs:
+        yield jobs
+
+
+async def scrape_mercor() -> JobBatches:
+    #Scrape jobs from Mercor
+    jobs = await fetch_jobs("https://work.mercor.com/explore", parse_mercor, 'Mercor')
+    if jobs:
+        yield jobs
 
 
-def scrape_remoteco() -> List[Dict]:
+async def scrape_remoteco() -> JobBatches:
     #Scrape jobs from Remote.co
-    jobs = []
     categories = [
         "accounting", "customer-service", "design", "developer", "online-data-entry",
         "online-editing", "entry-level", "freelance", "healthcare", "human-resources",
@@ -256,120 +568,197 @@ def scrape_remoteco() -> List[Dict]:
         "project-management", "recruiter", "sales", "software", "teaching", "writing"
     ]
     
-    for category in categories:
-        url = f"https://remote.co/remote-jobs/{category}"
-        
-        result = scrape_with_retry(url, formats=['html'])
-        if not result or not hasattr(result, 'html'):
-            continue
-        
-        soup = BeautifulSoup(result.html, 'html.parser')
-        job_links = soup.find_all('a', id=re.compile(r'^job-name-'))
-        
-        for link in job_links:
-            title = link.get_text(strip=True)
-            title = re.sub(r'\s*(New!|Today)\s*', '', title).strip()
-            
-            if not title or len(title) < 5:
-                continue
-            
-            job_url = link.get('href', '')
-            if job_url and not job_url.startswith('http'):
-                job_url = f"https://remote.co{job_url}"
-            
-            # Extract company from card
-            parent_card = link.find_parent(['div', 'article', 'li'])
-            company = "N/A"
-            
-            if parent_card:
-                # Try image alt text first
-                company_img = parent_card.find('img', alt=True)
-                if company_img:
-                    alt = company_img.get('alt', '').strip()
-                    if alt and len(alt) > 2 and alt.lower() not in ['logo', 'image', 'icon']:
-                        company = alt
-            
-            job = extract_job_data({
-                'title': title,
-                'company': company,
-                'location': 'Remote',
-                'job_type': 'Full-time',
-                'apply_url': job_url
-            }, 'Remote.co')
-            
-            if job:
-                jobs.append(job)
-        
-        time.sleep(4)
+    # Listings already collected from another category are skipped while parsing
+    seen_urls: Set[str] = set()
+    stats: Dict[str, Tuple[int, int]] = {}
+    
+    async def parse_category(url: str, html: str) -> List[Job]:
+        category = url.rsplit('/', 1)[-1]
+        parsed, skipped = await _parse_stage.parse(parse_remoteco_category, html, frozenset(seen_urls))
+        jobs = await with_fallback(url, html, 'Remote.co', parsed, skipped=skipped)
+        if jobs is not parsed:
+            # LLM output includes the listings the parser skipped; reconciliation counts them instead
+            skipped = 0
+        # Categories parsed at the same time can't see each other's URLs, so reconcile here
+        fresh = [job for job in jobs if job.apply_url not in seen_urls]
+        seen_urls.update(job.apply_url for job in fresh)
+        stats[category] = (len(fresh), skipped + len(jobs) - len(fresh))
+        return fresh
+    
+    # All categories go out as one batch; each is parsed and handed on as soon as it arrives
+    urls = [f"https://remote.co/remote-jobs/{category}" for category in categories]
+    async for _, jobs in fetch_parsed(urls, parse_category):
+        if jobs:
+            yield jobs
     
-    return jobs
+    for category in categories:
+        if category in stats:
+            new, duplicates = stats[category]
+            print(f"  Remote.co/{category}: {new} new, {duplicates} duplicates")
+        else:
+            print(f"  Remote.co/{category}: fetch failed")
 
 
-def deduplicate_jobs(jobs: List[Dict]) -> List[Dict]:
-    #Remove duplicate job listings based on URL
-    seen_urls = set()
-    unique_jobs = []
-    
+def iter_unique_jobs(jobs: Iterable[Job], seen_urls: Set[str]) -> Iterator[Job]:
+    #Yield jobs whose canonical URL isn't in seen_urls yet, adding it; share seen_urls across batches
     for job in jobs:
-        url = job.get('apply_url', '')
+        url = canonicalize_url(job.apply_url) if job.apply_url else ''
         if url and url not in seen_urls:
             seen_urls.add(url)
-            unique_jobs.append(job)
-    
-    return unique_jobs
+            yield job
 
 
-def export_to_csv(jobs: List[Dict], filename: str = "jobs.csv") -> None:
+def deduplicate_jobs(jobs: List[Job]) -> List[Job]:
+    #Remove duplicate job listings based on URL
+    return list(iter_unique_jobs(jobs, set()))
+
+
+def export_to_csv(jobs: List[Job], filename: str = "jobs.csv") -> None:
     #Export jobs to CSV file
     if not jobs:
         return
     
     with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-        fieldnames = ['title', 'company', 'location', 'job_type', 'apply_url', 'source']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer = csv.DictWriter(csvfile, fieldnames=JOB_FIELDS)
         writer.writeheader()
-        writer.writerows(jobs)
+        writer.writerows(job.to_dict() for job in jobs)
 
 
-def export_to_json(jobs: List[Dict], filename: str = "jobs.json") -> None:
+def export_to_json(jobs: List[Job], filename: str = "jobs.json") -> None:
     #Export jobs to JSON file
     with open(filename, 'w', encoding='utf-8') as jsonfile:
-        json.dump(jobs, jsonfile, indent=2, ensure_ascii=False)
+        json.dump([job.to_dict() for job in jobs], jsonfile, indent=2, ensure_ascii=False)
 
 
-def main():
-    #Main execution function
-    print(f"Initializing scraper with {len(API_KEYS)} API key(s)...")
-    
-    all_jobs = []
-    scrapers = [
-        ('Workable', scrape_workable),
-        ('DynamiteJobs', scrape_dynamitejobs),
-        ('Remotive', scrape_remotive),
-        ('Mercor', scrape_mercor),
-        ('Remote.co', scrape_remoteco)
-    ]
+async def run_scrapers(scrapers: List[Tuple[str, Callable[[], JobBatches]]],
+                       concurrency: int = MAX_CONCURRENCY,
+                       on_jobs: Optional[Callable[[str, List[Job]], Awaitable[None]]] = None) -> List[Tuple[str, int]]:
+    #Run every source adapter concurrently, handing each batch to on_jobs as it arrives;
+    #returns how many jobs each source produced, in scraper order
+    global _fetch_slots, _parse_stage
+    _fetch_slots = asyncio.Semaphore(concurrency)
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=concurrency))
+    _parse_stage = ParseStage()
+    _parse_stage.start()
     
-    for name, scraper in scrapers:
+    async def run_one(name: str, scraper: Callable[[], JobBatches]) -> int:
         print(f"Scraping {name}...")
-        jobs = scraper()
-        all_jobs.extend(jobs)
-        print(f"Collected {len(jobs)} jobs from {name}")
+        count = 0
+        async for jobs in scraper():
+            count += len(jobs)
+            if on_jobs:
+                await on_jobs(name, jobs)
+        print(f"Collected {count} jobs from {name}")
+        return count
     
-    print(f"\nTotal jobs collected: {len(all_jobs)}")
-    
-    # Deduplicate
-    unique_jobs = deduplicate_jobs(all_jobs)
-    duplicates_removed = len(all_jobs) - len(unique_jobs)
-    print(f"Removed {duplicates_removed} duplicates")
-    print(f"Final unique jobs: {len(unique_jobs)}")
+    try:
+        counts = await asyncio.gather(*(run_one(name, scraper) for name, scraper in scrapers))
+    finally:
+        await _parse_stage.close()
+    return [(name, count) for (name, _), count in zip(scrapers, counts)]
+
+
+def main(cache_mode: str = CACHE_USE, incremental: bool = False, stream: Optional[str] = None,
+         parquet_dir: Optional[str] = None, enrich: bool = False):
+    #Main execution function
+    stream = stream or ('jobs_new.jsonl' if incremental else 'jobs.jsonl')
+    writer = JsonlWriter(stream)
     
-    # Export
-    export_to_json(unique_jobs)
-    export_to_csv(unique_jobs)
-    print(f"\nExported to jobs.json and jobs.csv")
-    print("Scraping complete.")
+    # Streaming to stdout keeps progress messages out of the pipe
+    with redirect_stdout(sys.stderr) if stream == '-' else nullcontext():
+        response_cache.mode = cache_mode
+        print(f"Initializing scraper with {len(key_pool)} API key(s)...")
+        
+        seen_index = SeenIndex()
+        dynamitejobs = scrape_dynamitejobs
+        if incremental:
+            print(f"Incremental mode: {len(seen_index)} listings known from previous runs")
+            dynamitejobs = partial(scrape_dynamitejobs, known=seen_index.known_urls(), window=INCREMENTAL_WINDOW)
+        
+        # Each batch is deduplicated, indexed, stored and streamed as it arrives, then dropped,
+        # so memory holds only the URL set rather than every job
+        run_at = utc_now()
+        store = JobStore()
+        seen_urls: Set[str] = set()
+        counts = {'unique': 0, 'new': 0, 'stored': 0}
+        
+        # Values found by earlier --enrich runs are applied on every run, so a plain run doesn't store
+        # parser defaults over them; only --enrich asks the LLM for fields not cached yet
+        global enrichment_cache
+        enrichment_cache = EnrichmentCache()
+        
+        async def handle_jobs(name: str, jobs: List[Job]) -> None:
+            # URLs are claimed before enrichment awaits, so other sources can't enrich the same listing
+            unique_jobs = list(iter_unique_jobs(jobs, seen_urls))
+            if enrich or enrichment_cache.entries:
+                unique_jobs = await enrich_jobs(unique_jobs, request_missing=enrich)
+            new_jobs, _ = seen_index.split_new(unique_jobs)
+            seen_index.record(unique_jobs)
+            counts['stored'] += store.upsert_jobs(unique_jobs, seen_at=run_at)
+            writer.write(new_jobs if incremental else unique_jobs)
+            counts['unique'] += len(unique_jobs)
+            counts['new'] += len(new_jobs)
+        
+        scrapers = [
+            ('Workable', scrape_workable),
+            ('DynamiteJobs', dynamitejobs),
+            ('Remotive', scrape_remotive),
+            ('Mercor', scrape_mercor),
+            ('Remote.co', scrape_remoteco)
+        ]
+        
+        results = asyncio.run(run_scrapers(scrapers, on_jobs=handle_jobs))
+        writer.close()
+        seen_index.save()
+        if enrich:
+            enrichment_cache.save()
+        
+        total = sum(count for _, count in results)
+        print(f"\nTotal jobs collected: {total}")
+        print(f"Removed {total - counts['unique']} duplicates")
+        print(f"Final unique jobs: {counts['unique']}")
+        print(f"Upserted {counts['stored']} jobs into {store.path}")
+        
+        if incremental:
+            print(f"New listings: {counts['new']}, refreshed last_seen for {counts['unique'] - counts['new']} known")
+        
+        # Export: JSON and CSV are views derived from the stream
+        if stream == '-':
+            print(f"\nStreamed {writer.count} jobs to stdout")
+        else:
+            json_file, csv_file = ('jobs_new.json', 'jobs_new.csv') if incremental else ('jobs.json', 'jobs.csv')
+            jsonl_to_json(stream, json_file)
+            jsonl_to_csv(stream, csv_file)
+            print(f"\nExported {writer.count} jobs to {stream}, {json_file} and {csv_file}")
+        if parquet_dir:
+            # Every listing seen so far on run_date, not just this run: an incremental run stops paging early,
+            # and its partitions replace the day's earlier ones, which must stay a full daily snapshot
+            run_date = run_at[:10]
+            exported = export_to_parquet(store.jobs_seen_since(f"{run_date}T00:00:00Z"), parquet_dir, run_date)
+            print(f"Exported {exported} jobs to {parquet_dir} (Parquet, by run_date/source)")
+        store.close()
+        print(f"LLM fallback: {fallback_stats['escalated']} pages escalated, "
+              f"{fallback_stats['replaced']} parsed from LLM extract ({extract_cache.hits} cached)")
+        if enrich or enrich_stats['enriched']:
+            print(f"Enrichment: {enrich_stats['enriched']} jobs filled in, {enrich_stats['fields']} fields "
+                  f"requested over {enrich_stats['calls']} extract calls")
+        print(f"Request errors: {retry_stats.summary()}")
+        print(f"Cache ({cache_mode}): {response_cache.hits} hits, {response_cache.misses} misses")
+        print("Scraping complete.")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Scrape remote job listings")
+    parser.add_argument('--cache-mode', choices=CACHE_MODES, default=CACHE_USE,
+                        help="use cached pages when fresh, refresh them all, or run offline from the cache only")
+    parser.add_argument('--incremental', action='store_true',
+                        help="stop paging at already-seen listings and export only new ones")
+    parser.add_argument('--stream', default=None,
+                        help="NDJSON output path, or - for stdout (default jobs.jsonl, jobs_new.jsonl when incremental)")
+    parser.add_argument('--parquet', nargs='?', const=PARQUET_DIR, default=None, metavar='DIR',
+                        help=f"also write partitioned Parquet (default directory {PARQUET_DIR})")
+    parser.add_argument('--enrich', action='store_true',
+                        help="ask the LLM for fields the parsers could only default (location, job type, company)")
+    args = parser.parse_args()
+    main(cache_mode=args.cache_mode, incremental=args.incremental, stream=args.stream, parquet_dir=args.parquet,
+         enrich=args.enrich)
@@ -0,0 +1,91 @@
+import os
+import sqlite3
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from url_canon import canonicalize_url
+
+DB_PATH = os.getenv('SCRAPER_DB', 'jobs.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    url_key    TEXT PRIMARY KEY,
+    apply_url  TEXT NOT NULL,
+    title      TEXT NOT NULL,
+    company    TEXT,
+    location   TEXT,
+    job_type   TEXT,
+    source     TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen  TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_source ON jobs (source);
+CREATE INDEX IF NOT EXISTS idx_jobs_company ON jobs (company);
+CREATE INDEX IF NOT EXISTS idx_jobs_last_seen ON jobs (last_seen);
+"""
+
+UPSERT = """
+INSERT INTO jobs (url_key, apply_url, title, company, location, job_type, source, first_seen, last_seen)
+VALUES (:url_key, :apply_url, :title, :company, :location, :job_type, :source, :seen_at, :seen_at)
+ON CONFLICT (url_key) DO UPDATE SET
+    apply_url = excluded.apply_url,
+    title = excluded.title,
+    company = excluded.company,
+    location = excluded.location,
+    job_type = excluded.job_type,
+    source = excluded.source,
+    last_seen = excluded.last_seen
+"""
+
+
+def utc_now() -> str:
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class JobStore:
+    #SQLite (WAL mode) store of every listing ever scraped, keyed by canonical apply_url
+
+    def __init__(self, path: str = DB_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def upsert_jobs(self, jobs: List[Dict], seen_at: Optional[str] = None) -> int:
+        #Insert new listings and refresh known ones in a single transaction; returns rows written
+        seen_at = seen_at or utc_now()
+        rows = [
+            {
+                'url_key': canonicalize_url(job['apply_url']),
+                'apply_url': job['apply_url'],
+                'title': job['title'],
+                'company': job.get('company'),
+                'location': job.get('location'),
+                'job_type': job.get('job_type'),
+                'source': job.get('source', 'unknown'),
+                'seen_at': seen_at,
+            }
+            for job in jobs if job.get('apply_url') and job.get('title')
+        ]
+        with self.conn:
+            self.conn.executemany(UPSERT, rows)
+        return len(rows)
+
+    def jobs_seen_since(self, since: str, source: Optional[str] = None) -> List[Dict]:
+        #Listings whose last_seen is at or after an ISO-8601 UTC timestamp
+        query = "SELECT * FROM jobs WHERE last_seen >= ?"
+        params: list = [since]
+        if source:
+            query += " AND source = ?"
+            params.append(source)
+        return [dict(row) for row in self.conn.execute(query + " ORDER BY last_seen", params)]
+
+    def new_since(self, since: str) -> List[Dict]:
+        #Listings first seen at or after an ISO-8601 UTC timestamp
+        return [dict(row) for row in self.conn.execute(
+            "SELECT * FROM jobs WHERE first_seen >= ? ORDER BY first_seen", (since,)
+        )]
+
+    def close(self) -> None:
+        self.conn.close()
@@ -0,0 +1,49 @@
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict
+
+JOB_FIELDS = ['title', 'company', 'location', 'job_type', 'apply_url', 'source']
+
+# Low-cardinality values repeated on nearly every listing; interned so all jobs share one string
+INTERNED_FIELDS = ('location', 'job_type', 'source')
+
+_FIELD_NAMES = frozenset(JOB_FIELDS)
+
+
+@dataclass
+class Job:
+    #A scraped listing: slotted, with repeated field values interned.
+    #Item access (job['apply_url'], job.get(...)) is kept for code shared with dict-shaped jobs.
+    __slots__ = tuple(JOB_FIELDS)
+
+    title: str
+    company: str
+    location: str
+    job_type: str
+    apply_url: str
+    source: str
+
+    def __post_init__(self) -> None:
+        for field in INTERNED_FIELDS:
+            value = getattr(self, field)
+            if type(value) is str:
+                setattr(self, field, sys.intern(value))
+
+    def __reduce__(self):
+        # Rebuild through __init__ so jobs coming back from parser processes are interned again
+        return Job, tuple(getattr(self, field) for field in JOB_FIELDS)
+
+    def __getitem__(self, field: str) -> Any:
+        if field not in _FIELD_NAMES:
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def get(self, field: str, default: Any = None) -> Any:
+        return getattr(self, field) if field in _FIELD_NAMES else default
+
+    def to_dict(self) -> Dict[str, str]:
+        return {field: getattr(self, field) for field in JOB_FIELDS}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Job':
+        return cls(**{field: data.get(field) for field in JOB_FIELDS})
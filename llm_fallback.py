@@ -0,0 +1,96 @@
+import hashlib
+import os
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+from bs4 import BeautifulSoup
+
+# Escalate pages the deterministic parsers handled poorly to LLM extract (SCRAPER_LLM_FALLBACK=0 disables)
+LLM_FALLBACK = os.getenv('SCRAPER_LLM_FALLBACK', '1') != '0'
+
+JOB_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "jobs": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "title": {"type": "string"},
+                    "company": {"type": "string"},
+                    "location": {"type": "string"},
+                    "job_type": {"type": "string"},
+                    "apply_url": {"type": "string"}
+                }
+            }
+        },
+        "next_page_url": {
+            "type": "string",
+            "description": "URL of the next page button or link"
+        }
+    }
+}
+
+# Per source, the fields its parser reads from the page and the placeholder it leaves when a lookup fails.
+# title and apply_url aren't measured: extract_job_data drops jobs missing either, so they never go missing.
+# Mercor's fallback location and job type are also its usual real values, so only its yield is checked.
+COMPLETENESS_FIELDS: Dict[str, Dict[str, str]] = {
+    'Workable': {'company': 'N/A'},
+    'DynamiteJobs': {'company': 'N/A'},
+    'Remotive': {'company': 'N/A'},
+    'Mercor': {},
+    'Remote.co': {'company': 'N/A'},
+}
+DEFAULT_COMPLETENESS_FIELDS = {'company': 'N/A'}
+
+# Per source: (fewest jobs a listing page should yield, lowest acceptable completeness).
+# Remote.co reads company only from logo alt text, which most cards lack (548 of 686 listings in jobs.json),
+# so a page without companies is normal there and only its yield is checked.
+SOURCE_THRESHOLDS: Dict[str, Tuple[int, float]] = {
+    'Workable': (5, 0.5),
+    'DynamiteJobs': (5, 0.5),
+    'Remotive': (5, 0.5),
+    'Mercor': (1, 0.3),
+    'Remote.co': (1, 0.0),
+}
+DEFAULT_THRESHOLD = (1, 0.3)
+
+
+def text_fingerprint(html: str) -> str:
+    #Hash of a page's visible text, so markup churn doesn't count as a change
+    text = BeautifulSoup(html, 'html.parser').get_text(' ', strip=True)
+    text = re.sub(r'\s+', ' ', text)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def completeness(jobs: Sequence, source: Optional[str] = None) -> float:
+    #Share of the source's parsed fields across jobs holding a real value rather than a placeholder
+    if not jobs:
+        return 0.0
+    fields = COMPLETENESS_FIELDS.get(source, DEFAULT_COMPLETENESS_FIELDS)
+    if not fields:
+        return 1.0
+    found = sum(
+        1 for job in jobs for field, placeholder in fields.items()
+        if (job.get(field) or '').strip() not in ('', placeholder)
+    )
+    return found / (len(jobs) * len(fields))
+
+
+def escalation_reason(source: str, jobs: Sequence, expect_jobs: bool = True, skipped: int = 0) -> str:
+    #Why a parsed page should go to LLM extract, or '' when the parser's result is good enough.
+    #skipped counts listings dropped on purpose (e.g. cross-category duplicates) towards the yield.
+    min_jobs, min_completeness = SOURCE_THRESHOLDS.get(source, DEFAULT_THRESHOLD)
+    if expect_jobs and len(jobs) + skipped < min_jobs:
+        return f"{len(jobs) + skipped} jobs < {min_jobs}"
+    if jobs and completeness(jobs, source) < min_completeness:
+        return f"completeness {completeness(jobs, source):.0%} < {min_completeness:.0%}"
+    return ''
+
+
+def observed_fields(job_data: Dict) -> Dict[str, str]:
+    #Drop the empty or non-string values LLM output sometimes carries before validation
+    return {key: value for key, value in job_data.items() if isinstance(value, str) and value.strip()}
+
+
+def jobs_from_extract(data: Dict) -> List[Dict]:
+    return [observed_fields(job) for job in (data or {}).get('jobs') or [] if isinstance(job, dict)]
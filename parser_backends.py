@@ -0,0 +1,180 @@
+import os
+from abc import ABC, abstractmethod
+from typing import List, Optional, Pattern
+
+# Which HTML engine the parse_* functions run on
+HTML_PARSER = 'html.parser'
+LXML = 'lxml'
+SELECTOLAX = 'selectolax'
+PARSER_BACKENDS = [HTML_PARSER, LXML, SELECTOLAX]
+
+PARSER_BACKEND = os.getenv('SCRAPER_PARSER_BACKEND', HTML_PARSER)
+
+
+class Node(ABC):
+    #Backend-neutral element: the handful of lookups the source parsers need
+
+    @abstractmethod
+    def find_all(self, tag: Optional[str] = None, attr: Optional[str] = None,
+                 pattern: Optional[Pattern] = None) -> List['Node']:
+        #Descendants with the tag whose attr is present (and matches pattern, if given)
+        ...
+
+    def find(self, tag: Optional[str] = None, attr: Optional[str] = None,
+             pattern: Optional[Pattern] = None) -> Optional['Node']:
+        matches = self.find_all(tag, attr, pattern)
+        return matches[0] if matches else None
+
+    @abstractmethod
+    def get(self, attr: str, default: str = '') -> str:
+        ...
+
+    @abstractmethod
+    def text(self) -> str:
+        #Concatenated stripped text, like BeautifulSoup's get_text(strip=True)
+        ...
+
+    @abstractmethod
+    def next_sibling(self, tag: str) -> Optional['Node']:
+        ...
+
+    @abstractmethod
+    def find_parent(self, tags: List[str]) -> Optional['Node']:
+        ...
+
+
+def _matches(value: Optional[str], pattern: Optional[Pattern]) -> bool:
+    if value is None:
+        return False
+    return pattern is None or pattern.search(value) is not None
+
+
+class SoupNode(Node):
+    #BeautifulSoup tree built by the stdlib html.parser
+
+    def __init__(self, tag):
+        self.tag = tag
+
+    def find_all(self, tag=None, attr=None, pattern=None):
+        attrs = {} if attr is None else {attr: pattern if pattern is not None else True}
+        return [SoupNode(t) for t in self.tag.find_all(tag, attrs=attrs)]
+
+    def find(self, tag=None, attr=None, pattern=None):
+        attrs = {} if attr is None else {attr: pattern if pattern is not None else True}
+        found = self.tag.find(tag, attrs=attrs)
+        return SoupNode(found) if found else None
+
+    def get(self, attr, default=''):
+        value = self.tag.get(attr, default)
+        return ' '.join(value) if isinstance(value, list) else value
+
+    def text(self):
+        return self.tag.get_text(strip=True)
+
+    def next_sibling(self, tag):
+        sibling = self.tag.find_next_sibling(tag)
+        return SoupNode(sibling) if sibling else None
+
+    def find_parent(self, tags):
+        parent = self.tag.find_parent(tags)
+        return SoupNode(parent) if parent else None
+
+
+def _text_pieces(element):
+    # Element text and child tails in document order, skipping comments like bs4 does
+    if isinstance(element.tag, str) and element.text:
+        yield element.text
+    for child in element:
+        yield from _text_pieces(child)
+        if child.tail:
+            yield child.tail
+
+
+class LxmlNode(Node):
+    #lxml.html element tree
+
+    def __init__(self, element):
+        self.element = element
+
+    def find_all(self, tag=None, attr=None, pattern=None):
+        found = []
+        elements = self.element.iterdescendants(tag) if tag else self.element.iterdescendants()
+        for element in elements:
+            if not isinstance(element.tag, str):
+                continue
+            if attr is not None and not _matches(element.get(attr), pattern):
+                continue
+            found.append(LxmlNode(element))
+        return found
+
+    def get(self, attr, default=''):
+        return self.element.get(attr, default)
+
+    def text(self):
+        return ''.join(piece.strip() for piece in _text_pieces(self.element))
+
+    def next_sibling(self, tag):
+        for sibling in self.element.itersiblings():
+            if sibling.tag == tag:
+                return LxmlNode(sibling)
+        return None
+
+    def find_parent(self, tags):
+        for ancestor in self.element.iterancestors():
+            if ancestor.tag in tags:
+                return LxmlNode(ancestor)
+        return None
+
+
+class LexborNode(Node):
+    #selectolax (lexbor) tree queried through CSS selectors
+
+    def __init__(self, node):
+        self.node = node
+
+    def find_all(self, tag=None, attr=None, pattern=None):
+        selector = (tag or '*') + (f'[{attr}]' if attr else '')
+        return [
+            LexborNode(n) for n in self.node.css(selector)
+            if attr is None or _matches(n.attributes.get(attr) or '', pattern)
+        ]
+
+    def get(self, attr, default=''):
+        value = self.node.attributes.get(attr, default)
+        return default if value is None else value
+
+    def text(self):
+        return self.node.text(deep=True, separator='', strip=True)
+
+    def next_sibling(self, tag):
+        sibling = self.node.next
+        while sibling is not None:
+            if sibling.tag == tag:
+                return LexborNode(sibling)
+            sibling = sibling.next
+        return None
+
+    def find_parent(self, tags):
+        parent = self.node.parent
+        while parent is not None:
+            if parent.tag in tags:
+                return LexborNode(parent)
+            parent = parent.parent
+        return None
+
+
+def parse_document(html: str, backend: Optional[str] = None) -> Node:
+    #Build the document tree with the configured backend
+    backend = backend or PARSER_BACKEND
+
+    if backend == HTML_PARSER:
+        from bs4 import BeautifulSoup
+        return SoupNode(BeautifulSoup(html, 'html.parser'))
+    if backend == LXML:
+        import lxml.html
+        return LxmlNode(lxml.html.document_fromstring(html))
+    if backend == SELECTOLAX:
+        from selectolax.lexbor import LexborHTMLParser
+        return LexborNode(LexborHTMLParser(html).root)
+
+    raise ValueError(f"Unknown parser backend: {backend}. Choose one of {', '.join(PARSER_BACKENDS)}")
@@ -0,0 +1,237 @@
+import re
+from typing import AbstractSet, Dict, List, Optional, Tuple
+from jobs import Job
+from parser_backends import parse_document
+from url_canon import canonicalize_url
+
+
+def extract_job_data(job_data: Dict, source: str) -> Optional[Job]:
+    #Validate and format job data
+    if not job_data.get('title') or not job_data.get('apply_url'):
+        return None
+    
+    return Job(
+        title=job_data['title'].strip(),
+        company=job_data.get('company', 'N/A').strip(),
+        location=job_data.get('location', 'Remote').strip(),
+        job_type=job_data.get('job_type', 'Full-time').strip(),
+        apply_url=canonicalize_url(job_data['apply_url']),
+        source=source
+    )
+
+
+def parse_workable(html: str, backend: Optional[str] = None) -> List[Job]:
+    #Parse job listings from a Workable search page
+    jobs = []
+    doc = parse_document(html, backend)
+    job_links = doc.find_all('a', 'href', re.compile(r'/view/'))
+    
+    for link in job_links[:150]:
+        title = link.text()
+        if not title or len(title) < 5:
+            continue
+        
+        job_url = link.get('href', '')
+        if job_url and not job_url.startswith('http'):
+            job_url = f"https://jobs.workable.com{job_url}"
+        
+        # Extract company from URL pattern
+        company = "N/A"
+        if '-at-' in job_url:
+            parts = job_url.split('/')[-1].split('-at-')
+            if len(parts) > 1:
+                company = parts[-1].replace('-', ' ').title()
+        
+        job = extract_job_data({
+            'title': title,
+            'company': company,
+            'location': 'Remote',
+            'job_type': 'Full-time',
+            'apply_url': job_url
+        }, 'Workable')
+        
+        if job:
+            jobs.append(job)
+    
+    return jobs
+
+
+def parse_dynamitejobs(html: str, backend: Optional[str] = None) -> List[Job]:
+    #Parse job listings from a DynamiteJobs results page
+    jobs = []
+    doc = parse_document(html, backend)
+    h2_elements = [h2 for h2 in doc.find_all('h2') if h2.get('href') and '/remote-job/' in h2.get('href')]
+    
+    for h2 in h2_elements:
+        title = h2.text()
+        if not title or len(title) < 5:
+            continue
+        
+        job_url = h2.get('href', '')
+        if job_url and not job_url.startswith('http'):
+            job_url = f"https://dynamitejobs.com{job_url}"
+        
+        # Extract company from next sibling
+        company = "N/A"
+        next_p = h2.next_sibling('p')
+        if next_p:
+            company = next_p.text()
+        
+        job = extract_job_data({
+            'title': title,
+            'company': company,
+            'location': 'Remote',
+            'job_type': 'Full-time',
+            'apply_url': job_url
+        }, 'DynamiteJobs')
+        
+        if job:
+            jobs.append(job)
+    
+    return jobs
+
+
+def parse_dynamitejobs_last_page(html: str) -> Optional[int]:
+    #Highest page number linked from the DynamiteJobs pagination, if any. The pager shows a window of
+    #pages around the current one, so this is a lower bound on the last page, not the last page itself
+    pages = [int(n) for n in re.findall(r'remote-jobs\?(?:[^"\'>]*?&(?:amp;)?)?page=(\d+)', html)]
+    return max(pages) if pages else None
+
+
+def parse_remotive(html: str, backend: Optional[str] = None) -> List[Job]:
+    #Parse job listings from the Remotive jobs page
+    jobs = []
+    doc = parse_document(html, backend)
+    job_links = doc.find_all('a', 'href', re.compile(r'/remote-jobs/[^/]+/[^/]+-\d+$'))
+    
+    for link in job_links[:150]:
+        title_text = link.text()
+        title = title_text
+        company = "N/A"
+        
+        # Extract company from title (format: "Title • Company")
+        if '•' in title_text:
+            parts = title_text.split('•')
+            title = parts[0].strip()
+            if len(parts) > 1:
+                company = parts[1].strip()
+        
+        job_url = link.get('href', '')
+        if job_url and not job_url.startswith('http'):
+            job_url = f"https://remotive.com{job_url}"
+        
+        if job_url.count('/') <= 4:
+            continue
+        
+        job = extract_job_data({
+            'title': title,
+            'company': company,
+            'location': 'Remote',
+            'job_type': 'Full-time',
+            'apply_url': job_url
+        }, 'Remotive')
+        
+        if job:
+            jobs.append(job)
+    
+    return jobs[:150]
+
+
+def parse_mercor(html: str, backend: Optional[str] = None) -> List[Job]:
+    #Parse job listings from the Mercor explore page
+    jobs = []
+    doc = parse_document(html, backend)
+    job_cards = doc.find_all('a', 'href', re.compile(r'listingId='))
+    
+    for card in job_cards[:150]:
+        title_elem = card.find('h2')
+        if not title_elem:
+            continue
+        
+        title = title_elem.text()
+        if not title or len(title) < 5:
+            continue
+        
+        job_url = card.get('href', '')
+        if job_url and not job_url.startswith('http'):
+            job_url = f"https://work.mercor.com{job_url}"
+        
+        # Extract metadata
+        location = "Remote"
+        job_type = "Contract"
+        
+        metadata_divs = card.find_all('div', 'class', re.compile(r'flex.*items-center.*gap-1.*text-sm'))
+        for div in metadata_divs:
+            text = div.text()
+            if any(kw in text for kw in ['Remote', 'Worldwide']):
+                location = text
+            elif 'full-time' in text.lower():
+                job_type = "Full-time"
+        
+        job = extract_job_data({
+            'title': title,
+            'company': 'Mercor',
+            'location': location,
+            'job_type': job_type,
+            'apply_url': job_url
+        }, 'Mercor')
+        
+        if job:
+            jobs.append(job)
+    
+    return jobs[:150]
+
+
+def parse_remoteco(html: str, backend: Optional[str] = None) -> List[Job]:
+    #Parse job listings from a Remote.co category page
+    return parse_remoteco_category(html, backend=backend)[0]
+
+
+def parse_remoteco_category(html: str, seen: AbstractSet[str] = frozenset(),
+                            backend: Optional[str] = None) -> Tuple[List[Job], int]:
+    #Parse a Remote.co category page, skipping cards whose URL is already in seen; returns (jobs, skipped)
+    jobs = []
+    skipped = 0
+    doc = parse_document(html, backend)
+    job_links = doc.find_all('a', 'id', re.compile(r'^job-name-'))
+    
+    for link in job_links:
+        job_url = link.get('href', '')
+        if job_url and not job_url.startswith('http'):
+            job_url = f"https://remote.co{job_url}"
+        
+        # The same listing appears under several categories; skip it before the card lookups
+        if canonicalize_url(job_url) in seen:
+            skipped += 1
+            continue
+        
+        title = link.text()
+        title = re.sub(r'\s*(New!|Today)\s*', '', title).strip()
+        
+        if not title or len(title) < 5:
+            continue
+        
+        # Extract company from card
+        parent_card = link.find_parent(['div', 'article', 'li'])
+        company = "N/A"
+        
+        if parent_card:
+            # Try image alt text first
+            company_img = parent_card.find('img', 'alt')
+            if company_img:
+                alt = company_img.get('alt', '').strip()
+                if alt and len(alt) > 2 and alt.lower() not in ['logo', 'image', 'icon']:
+                    company = alt
+        
+        job = extract_job_data({
+            'title': title,
+            'company': company,
+            'location': 'Remote',
+            'job_type': 'Full-time',
+            'apply_url': job_url
+        }, 'Remote.co')
+        
+        if job:
+            jobs.append(job)
+    
+    return jobs, skipped
@@ -0,0 +1,117 @@
+import os
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+# Target-site pacing (requests per minute per domain)
+DOMAIN_REQUESTS_PER_MINUTE = float(os.getenv('SCRAPER_DOMAIN_RPM', '30'))
+
+# AIMD tuning: additive step as a fraction of the starting rate, multiplicative cut on 429
+AIMD_INCREASE = 0.1
+AIMD_DECREASE = 0.5
+AIMD_MAX_FACTOR = 4.0
+AIMD_MIN_FACTOR = 0.1
+
+
+class TokenBucket:
+    #Thread-safe token bucket whose refill rate adapts with AIMD
+
+    def __init__(self, requests_per_minute: float, burst: float = 1.0):
+        base = requests_per_minute / 60.0
+        self.rate = base
+        self.min_rate = base * AIMD_MIN_FACTOR
+        self.max_rate = base * AIMD_MAX_FACTOR
+        self.step = base * AIMD_INCREASE
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        if self.rate > 0:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self) -> float:
+        #Seconds until a token would be available, without taking one
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            return self._delay(now)
+
+    def _delay(self, now: float) -> float:
+        if self.rate <= 0:
+            return max(0.0, self.blocked_until - now)
+        wait = max(0.0, (1 - self.tokens) / self.rate)
+        return max(wait, self.blocked_until - now)
+
+    def acquire(self) -> None:
+        #Block until a token is available and take it
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._delay(now)
+                if wait <= 0:
+                    self.tokens -= 1
+                    return
+            time.sleep(wait)
+
+    def on_success(self) -> None:
+        #Additive increase after a request went through
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.step)
+
+    def on_rate_limited(self, retry_after: Optional[float] = None) -> float:
+        #Multiplicative decrease, and hold all requests until Retry-After has passed;
+        #returns how long the next request will now be held
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate * AIMD_DECREASE)
+            self.tokens = min(self.tokens, 0.0)
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+            return self._delay(now)
+
+
+class DomainLimiter:
+    #One adaptive token bucket per target domain
+
+    def __init__(self, requests_per_minute: float = DOMAIN_REQUESTS_PER_MINUTE):
+        self.requests_per_minute = requests_per_minute
+        self.buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket_for(self, url: str) -> TokenBucket:
+        domain = urlparse(url).netloc.lower()
+        with self._lock:
+            if domain not in self.buckets:
+                self.buckets[domain] = TokenBucket(self.requests_per_minute)
+            return self.buckets[domain]
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    #Read a Retry-After hint from a Firecrawl error's response headers or message
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    value = headers.get('Retry-After') if hasattr(headers, 'get') else None
+
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+
+    # Firecrawl's rate limit message reads "... please retry after 39s, resets at ..."
+    match = re.search(r'retry after (\d+(?:\.\d+)?)\s*s', str(error), re.IGNORECASE)
+    if match:
+        return float(match.group(1))
+    return None
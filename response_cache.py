@@ -0,0 +1,159 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+# Cache modes
+CACHE_USE = 'use'
+CACHE_REFRESH = 'refresh'
+CACHE_OFFLINE = 'offline'
+CACHE_MODES = [CACHE_USE, CACHE_REFRESH, CACHE_OFFLINE]
+
+CACHE_DIR = os.getenv('SCRAPER_CACHE_DIR', '.cache/firecrawl')
+EXTRACT_CACHE_DIR = os.getenv('SCRAPER_EXTRACT_CACHE_DIR', '.cache/extract')
+CACHE_MAX_BYTES = int(os.getenv('SCRAPER_CACHE_MAX_MB', '500')) * 1024 * 1024
+DEFAULT_TTL = int(os.getenv('SCRAPER_CACHE_TTL', '3600'))
+
+# Per-source freshness in seconds; listing boards that churn fastest expire first
+SOURCE_TTLS = {
+    'jobs.workable.com': 6 * 3600,
+    'dynamitejobs.com': 3600,
+    'remotive.com': 3600,
+    'work.mercor.com': 6 * 3600,
+    'remote.co': 3600,
+}
+
+
+def cache_key(url: str, formats: List[str], options: Optional[Dict] = None) -> str:
+    #Content address for a scrape request
+    payload = json.dumps({'url': url, 'formats': sorted(formats), 'options': options or {}}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    #Gzip-compressed scrape results on disk with per-source TTL and LRU eviction by size
+
+    def __init__(self, directory: str = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES,
+                 mode: str = CACHE_USE):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        self._sizes: Optional[Dict[str, int]] = None
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json.gz")
+
+    def _index(self) -> Dict[str, int]:
+        # Lazily scan the directory once so eviction knows the current footprint
+        if self._sizes is None:
+            self._sizes = {}
+            for root, _, files in os.walk(self.directory):
+                for name in files:
+                    path = os.path.join(root, name)
+                    self._sizes[path] = os.path.getsize(path)
+        return self._sizes
+
+    def ttl_for(self, url: str) -> int:
+        return SOURCE_TTLS.get(urlparse(url).netloc.lower(), DEFAULT_TTL)
+
+    def get(self, url: str, formats: List[str], options: Optional[Dict] = None) -> Optional[SimpleNamespace]:
+        #Return a cached result, or None when missing, expired or the mode skips reads
+        if self.mode == CACHE_REFRESH:
+            return None
+
+        path = self._path(cache_key(url, formats, options))
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        if self.mode != CACHE_OFFLINE and time.time() - entry['fetched_at'] > self.ttl_for(url):
+            self.misses += 1
+            return None
+
+        # Touch on read so eviction drops the least recently used entries
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return SimpleNamespace(**entry['fields'])
+
+    def put(self, url: str, formats: List[str], result: object, options: Optional[Dict] = None) -> None:
+        #Store the requested formats of a scrape result
+        fields = {fmt: getattr(result, fmt, None) for fmt in formats}
+        if all(value is None for value in fields.values()):
+            return
+
+        path = self._path(cache_key(url, formats, options))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump({'url': url, 'fetched_at': time.time(), 'fields': fields}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            sizes = self._index()
+            sizes[path] = os.path.getsize(path)
+            self._evict(sizes)
+
+    def _evict(self, sizes: Dict[str, int]) -> None:
+        total = sum(sizes.values())
+        if total <= self.max_bytes:
+            return
+
+        by_age = sorted(sizes, key=lambda p: os.path.getmtime(p) if os.path.exists(p) else 0)
+        for path in by_age:
+            if total <= self.max_bytes:
+                break
+            total -= sizes.pop(path)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class ExtractCache:
+    #Last LLM extract result per URL, reused while the page content fingerprint is unchanged
+
+    def __init__(self, directory: str = EXTRACT_CACHE_DIR):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, url: str, schema: Dict) -> str:
+        key = cache_key(url, ['extract'], {'schema': schema})
+        return os.path.join(self.directory, key[:2], f"{key}.json.gz")
+
+    def get(self, url: str, schema: Dict, fingerprint: str) -> Optional[Dict]:
+        try:
+            with gzip.open(self._path(url, schema), 'rt', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        if entry.get('fingerprint') != fingerprint:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry['data']
+
+    def put(self, url: str, schema: Dict, fingerprint: str, data: Dict) -> None:
+        path = self._path(url, schema)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump({'url': url, 'fingerprint': fingerprint, 'extracted_at': time.time(), 'data': data},
+                      f, ensure_ascii=False)
+        os.replace(tmp_path, path)
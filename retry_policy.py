@@ -0,0 +1,162 @@
+import random
+import re
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, Optional, Set, TypeVar
+from firecrawl_pool import KeyLane, KeyPool
+from rate_control import retry_after_seconds
+
+T = TypeVar('T')
+
+# Error classes
+RATE_LIMIT = 'rate_limit'
+CREDITS_EXHAUSTED = 'credits_exhausted'
+TRANSIENT = 'transient'
+PERMANENT = 'permanent'
+
+TRANSIENT_ERROR_NAMES = {
+    'Timeout', 'TimeoutError', 'ReadTimeout', 'ConnectTimeout', 'RequestTimeoutError',
+    'ConnectionError', 'ChunkedEncodingError', 'InternalServerError', 'ServiceUnavailableError',
+}
+
+
+def error_status(error: Exception) -> Optional[int]:
+    #Pull the HTTP status code out of a Firecrawl or requests exception
+    for holder in (error, getattr(error, 'response', None)):
+        status = getattr(holder, 'status_code', None)
+        if isinstance(status, int):
+            return status
+    match = re.search(r'\b([45]\d\d)\b', str(error))
+    return int(match.group(1)) if match else None
+
+
+def error_type_names(error: Exception) -> Set[str]:
+    #Class names of an exception and its bases; a replayed error reports those of the error it was recorded from
+    recorded = getattr(error, 'error_types', None)
+    if recorded:
+        return set(recorded)
+    return {cls.__name__ for cls in type(error).__mro__}
+
+
+def classify_error(error: Exception) -> str:
+    #Map an exception from a Firecrawl call onto one of the retry classes
+    message = str(error).lower()
+    status = error_status(error)
+
+    if status == 429 or 'rate limit' in message:
+        return RATE_LIMIT
+    if status == 402 or 'payment required' in message or 'insufficient credits' in message:
+        return CREDITS_EXHAUSTED
+    if status == 408 or (status is not None and status >= 500):
+        return TRANSIENT
+    if error_type_names(error) & TRANSIENT_ERROR_NAMES:
+        return TRANSIENT
+    return PERMANENT
+
+
+class RetryPolicy:
+    #Exponential backoff with full jitter for transient failures
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 1.0, max_delay: float = 30.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** min(attempt, 32)))
+
+
+class RetryStats:
+    #Thread-safe per-class error counters and time each class cost in backoff or rate-limit holds
+
+    def __init__(self):
+        self.errors: Counter = Counter()
+        self.wait_seconds: Dict[str, float] = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, error_class: str, waited: float = 0.0) -> None:
+        with self._lock:
+            self.errors[error_class] += 1
+            self.wait_seconds[error_class] += waited
+
+    def summary(self) -> str:
+        with self._lock:
+            if not self.errors:
+                return "No request errors"
+            return ", ".join(
+                f"{name}: {count} ({self.wait_seconds[name]:.1f}s waiting)"
+                for name, count in sorted(self.errors.items())
+            )
+
+
+retry_stats = RetryStats()
+
+
+def call_with_retry(pool: KeyPool, call: Callable[[KeyLane], T], url: Optional[str] = None,
+                    policy: Optional[RetryPolicy] = None, stats: RetryStats = retry_stats) -> Optional[T]:
+    #Run a Firecrawl call on the pool, retrying according to the error class
+    policy = policy or RetryPolicy(max_attempts=3 * len(pool))
+
+    for attempt in range(policy.max_attempts):
+        delay = 0.0
+        try:
+            with pool.lane(url) as lane:
+                try:
+                    result = call(lane)
+                    pool.record_success(lane, url)
+                    return result
+                except Exception as e:
+                    error_class = classify_error(e)
+                    waited = 0.0
+                    if error_class == RATE_LIMIT:
+                        # The key's bucket holds further requests until Retry-After; that hold is the cost
+                        waited = pool.record_rate_limited(lane, retry_after_seconds(e))
+                    elif error_class == CREDITS_EXHAUSTED:
+                        pool.park(lane)
+                    elif error_class == TRANSIENT:
+                        delay = waited = policy.backoff(attempt)
+                    stats.record(error_class, waited)
+                    if error_class == PERMANENT:
+                        return None
+        except RuntimeError:
+            # Every key is parked
+            return None
+
+        if delay:
+            time.sleep(delay)
+
+    return None
+
+
+def poll_with_retry(pool: KeyPool, lane: KeyLane, call: Callable[[KeyLane], T], deadline: float,
+                    policy: Optional[RetryPolicy] = None, stats: RetryStats = retry_stats) -> Optional[T]:
+    #Poll an async Firecrawl job on the key that started it. Giving up abandons work already paid for,
+    #so rate-limit and transient errors are retried until the deadline; None on a permanent error or timeout
+    policy = policy or RetryPolicy()
+
+    attempt = 0
+    while True:
+        lane.bucket.acquire()
+        delay = 0.0
+        try:
+            result = call(lane)
+            pool.record_success(lane)
+            return result
+        except Exception as e:
+            error_class = classify_error(e)
+            waited = 0.0
+            if error_class == RATE_LIMIT:
+                waited = pool.record_rate_limited(lane, retry_after_seconds(e))
+            elif error_class == TRANSIENT:
+                delay = waited = policy.backoff(attempt)
+            stats.record(error_class, waited)
+            if error_class not in (RATE_LIMIT, TRANSIENT):
+                print(f"Poll failed ({error_class}): {str(e)[:100]}")
+                return None
+            if time.monotonic() + waited >= deadline:
+                print(f"Poll gave up at its deadline after {attempt + 1} failed attempt(s): {str(e)[:100]}")
+                return None
+
+        time.sleep(delay)
+        attempt += 1
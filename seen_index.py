@@ -0,0 +1,65 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, FrozenSet, List, Tuple
+
+SEEN_INDEX_PATH = os.getenv('SCRAPER_SEEN_INDEX', 'seen_index.json')
+
+# Prior run output used to seed the index the first time it is created
+SEED_FILE = 'jobs.json'
+
+
+class SeenIndex:
+    #apply_url -> first_seen/last_seen timestamps, persisted between runs
+
+    def __init__(self, path: str = SEEN_INDEX_PATH, seed_file: str = SEED_FILE):
+        self.path = path
+        self.entries: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.entries = json.load(f)
+        elif seed_file and os.path.exists(seed_file):
+            seeded_at = os.path.getmtime(seed_file)
+            with open(seed_file, encoding='utf-8') as f:
+                for job in json.load(f):
+                    url = job.get('apply_url')
+                    if url:
+                        self.entries[url] = {'first_seen': seeded_at, 'last_seen': seeded_at}
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def known_urls(self) -> FrozenSet[str]:
+        with self._lock:
+            return frozenset(self.entries)
+
+    def split_new(self, jobs: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        #(new, known) jobs relative to previous runs
+        new, known = [], []
+        for job in jobs:
+            (known if job.get('apply_url') in self.entries else new).append(job)
+        return new, known
+
+    def record(self, jobs: List[Dict]) -> None:
+        #Add new listings and refresh last_seen for known ones
+        now = time.time()
+        with self._lock:
+            for job in jobs:
+                url = job.get('apply_url')
+                if not url:
+                    continue
+                entry = self.entries.setdefault(url, {'first_seen': now, 'last_seen': now})
+                entry['last_seen'] = now
+
+    def save(self) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with self._lock:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,92 @@
+import os
+import re
+from functools import lru_cache
+from urllib.parse import quote, quote_plus, unquote_plus, urlsplit, urlunsplit
+
+# Distinct URLs remembered by the memoized fast path
+CANON_CACHE_SIZE = int(os.getenv('SCRAPER_URL_CACHE', '65536'))
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = frozenset({
+    'gclid', 'dclid', 'fbclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid',
+    '_hsenc', '_hsmi', 'ref', 'ref_src', 'referrer', 'trk',
+})
+TRACKING_PREFIXES = ('utm_',)
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# The scheme is rewritten to https, so its default port goes too: http://host:443 is https://host
+CANONICAL_PORT = DEFAULT_PORTS['https']
+
+# Characters left as-is in a path besides letters, digits and -._~
+PATH_SAFE = "/%:@!$&'()*+,;="
+
+UNRESERVED = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~')
+
+_ESCAPE = re.compile(r'%([0-9A-Fa-f]{2})')
+
+
+def _normalize_escape(match: re.Match) -> str:
+    # %7E -> ~ for unreserved characters, upper-case hex for everything else
+    char = chr(int(match.group(1), 16))
+    return char if char in UNRESERVED else '%' + match.group(1).upper()
+
+
+def _is_tracking(param: str) -> bool:
+    name = param.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def _canonical_netloc(parts) -> str:
+    if not any(c in parts.netloc for c in ':@['):
+        # Plain host name, by far the common case
+        return parts.netloc.lower().rstrip('.')
+
+    host = (parts.hostname or '').rstrip('.')
+    if ':' in host:
+        host = f"[{host}]"
+    try:
+        port = parts.port
+    except ValueError:
+        return parts.netloc.lower()
+    if port and port not in (DEFAULT_PORTS[parts.scheme.lower()], CANONICAL_PORT):
+        host = f"{host}:{port}"
+    if parts.username:
+        host = f"{parts.netloc.rsplit('@', 1)[0]}@{host}"
+    return host
+
+
+def _canonical_query(query: str) -> str:
+    # Sorted by key only, so repeated keys keep their value order; bare keys (?flag) stay bare
+    params = []
+    for param in query.split('&'):
+        key, sep, value = param.partition('=')
+        key = unquote_plus(key)
+        if key and not _is_tracking(key):
+            params.append((key, quote_plus(key) + (sep and '=' + quote_plus(unquote_plus(value)))))
+    params.sort(key=lambda param: param[0])
+    return '&'.join(encoded for _, encoded in params)
+
+
+def _canonicalize(url: str) -> str:
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS:
+        return url.strip()
+
+    path = quote(parts.path, safe=PATH_SAFE)
+    if '%' in path:
+        path = _ESCAPE.sub(_normalize_escape, path)
+    path = path.rstrip('/') or '/'
+
+    query = _canonical_query(parts.query) if parts.query else ''
+
+    # Listings are the same page over http and https
+    return urlunsplit(('https', _canonical_netloc(parts), path, query, ''))
+
+
+@lru_cache(maxsize=CANON_CACHE_SIZE)
+def canonicalize_url(url: str) -> str:
+    #Canonical form of a listing URL: https, lower-case host without default port or fragment,
+    #normalized percent-encoding, no trailing slash, tracking parameters dropped and the rest sorted
+    return _canonicalize(url)